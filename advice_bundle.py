@@ -0,0 +1,143 @@
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from typing import Dict, Iterable, List
+
+from advice_cache import normalize_skill, prompt_version
+from gemini_integration import GeminiSkillsAdvisor, MODEL_NAME, SKILL_PROMPT
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_FORMAT = 1
+
+
+def bundle_skills(job_roles_skills: Dict[str, List[str]]) -> List[str]:
+    """Every skill that check_missing_skills can report: the union of all role requirements, in first-seen order"""
+    skills = {}
+    for required in job_roles_skills.values():
+        for skill in required:
+            skills.setdefault(normalize_skill(skill), skill)
+    return list(skills.values())
+
+
+def load_bundle(path: str, model_name: str = MODEL_NAME) -> Dict[str, str]:
+    """
+    Advice from a bundle written by this module
+    A bundle built with a different prompt template or model is ignored, since its
+    answers would not be what the advisor now generates.
+    Args:
+        path: Bundle file
+        model_name: Model the advisor uses
+    Returns:
+        dict: Normalized skill name -> advice; empty if the file is missing or stale
+    """
+    if not os.path.exists(path):
+        logger.warning(f"Advice bundle {path} not found")
+        return {}
+    with open(path) as f:
+        bundle = json.load(f)
+
+    expected = prompt_version(SKILL_PROMPT, model_name)
+    if bundle.get("format") != BUNDLE_FORMAT or bundle.get("prompt_version") != expected:
+        logger.warning(f"Ignoring advice bundle {path}: built for prompt version {bundle.get('prompt_version')}, "
+                       f"expected {expected}")
+        return {}
+    return bundle["advice"]
+
+
+def write_bundle(path: str, advice: Dict[str, str], model_name: str) -> None:
+    """Write the bundle atomically, so an interrupted run never leaves a truncated file"""
+    bundle = {
+        "format": BUNDLE_FORMAT,
+        "model_name": model_name,
+        "prompt_version": prompt_version(SKILL_PROMPT, model_name),
+        "updated": time.time(),
+        "advice": advice,
+    }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(bundle, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def prewarm(skills: Iterable[str], out_path: str, advisor: GeminiSkillsAdvisor, requests_per_minute: float = 15,
+            retries: int = 3, backoff: float = 10.0) -> Dict:
+    """
+    Fetch advice for every skill not yet in the bundle at out_path, saving after each one
+    Calls start at most requests_per_minute apart. A failed call is retried with
+    exponential backoff; a skill that still fails is left out, so the next run
+    tries it again.
+    Args:
+        skills: Skill names to cover
+        out_path: Bundle file; an existing one for the same prompt version is resumed
+        advisor (GeminiSkillsAdvisor): Supplies the model and model name
+        requests_per_minute: Rate limit for model calls
+        retries: Extra attempts per skill
+        backoff: Seconds before the first retry; doubled for each further one
+    Returns:
+        dict: Counts of fetched and failed skills, and of requested skills already in the bundle
+    """
+    skills = list(skills)
+    advice = load_bundle(out_path, advisor.model_name) if os.path.exists(out_path) else {}
+    todo = [skill for skill in skills if normalize_skill(skill) not in advice]
+    already_present = len(skills) - len(todo)
+    if already_present:
+        logger.info(f"Resuming: {already_present} of {len(skills)} skills already in {out_path}")
+
+    interval = 60.0 / requests_per_minute if requests_per_minute > 0 else 0.0
+    next_call = time.monotonic()
+    fetched = failed = 0
+    for i, skill in enumerate(todo, 1):
+        for attempt in range(retries + 1):
+            time.sleep(max(0.0, next_call - time.monotonic()))
+            next_call = time.monotonic() + interval
+            try:
+                text = advisor.model.generate_content(SKILL_PROMPT.format(skill_name=skill)).text
+                break
+            except Exception as e:
+                if attempt == retries:
+                    logger.error(f"Giving up on {skill}: {e}")
+                    text = None
+                else:
+                    delay = backoff * 2 ** attempt
+                    logger.warning(f"Advice for {skill} failed ({e}); retrying in {delay:g}s")
+                    next_call = max(next_call, time.monotonic() + delay)
+
+        if text:
+            advice[normalize_skill(skill)] = text
+            write_bundle(out_path, advice, advisor.model_name)
+            fetched += 1
+        else:
+            failed += 1
+        logger.info(f"{i}/{len(todo)} skills")
+
+    logger.info(f"Fetched {fetched}, failed {failed}, already present {already_present}; "
+                f"{len(advice)} skills in {out_path}")
+    return {"fetched": fetched, "failed": failed, "already_present": already_present}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Pre-generate Gemini advice for every skill a role can require')
+    parser.add_argument('--out', type=str, default='advice_bundle.json', help='Bundle file; an existing one is resumed')
+    parser.add_argument('--rpm', type=float, default=15, help='Model calls per minute')
+    parser.add_argument('--retries', type=int, default=3, help='Retries per skill')
+    parser.add_argument('--model', type=str, default=MODEL_NAME, help='Gemini model')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    try:
+        from resume_parser import ResumeParser
+        skills = bundle_skills(ResumeParser(nlp_mode="none").job_roles_skills)
+        logger.info(f"{len(skills)} distinct skills across all roles")
+        stats = prewarm(skills, args.out, GeminiSkillsAdvisor(model_name=args.model), args.rpm, args.retries)
+        return 0 if stats["failed"] == 0 else 1
+    except Exception as e:
+        logger.error(f"Error in main: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+import hashlib
+import time
+from typing import Dict, Optional
+
+from tiered_cache import TieredCache
+
+
+def normalize_skill(skill_name: str) -> str:
+    """Case- and whitespace-insensitive form of a skill name"""
+    return " ".join(skill_name.lower().split())
+
+
+def prompt_version(prompt_template: str, model_name: str) -> str:
+    """Short hash of the prompt template and model, so a change to either invalidates cached advice"""
+    return hashlib.sha256(f"{model_name}\n{prompt_template}".encode()).hexdigest()[:16]
+
+
+class AdviceCache(TieredCache):
+    def __init__(self, max_entries: int = 4096, db_path: Optional[str] = None, ttl: float = 7 * 24 * 3600,
+                 max_disk_entries: int = 100000):
+        """
+        Two-tier cache of generated skill advice
+        Keys come from advice_key(): the normalized skill name plus a hash of the prompt
+        template and model name. Besides the hit counters, stats() reports the mean
+        lookup time and the mean model-call time of the answers put in the cache.
+        Args:
+            max_entries: Size of the in-memory LRU tier
+            db_path: SQLite file for the on-disk tier; None keeps the cache in memory only
+            ttl: Seconds an entry stays valid; 0 or None never expires
+            max_disk_entries: Rows kept in the SQLite tier
+        """
+        super().__init__("advice_cache", max_entries, db_path, ttl, max_disk_entries)
+        self.lookup_seconds = 0.0
+        self.fills = 0
+        self.fill_seconds = 0.0
+
+    @staticmethod
+    def advice_key(skill_name: str, prompt_template: str, model_name: str) -> str:
+        return f"{prompt_version(prompt_template, model_name)}:{normalize_skill(skill_name)}"
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached advice for key, or None if absent or expired"""
+        start = time.perf_counter()
+        try:
+            return super().get(key)
+        finally:
+            self.lookup_seconds += time.perf_counter() - start
+
+    def put(self, key: str, advice: str, fill_seconds: Optional[float] = None) -> None:
+        """
+        Store advice
+        Args:
+            fill_seconds: How long generating it took, for the latency stats
+        """
+        if fill_seconds is not None:
+            self.fills += 1
+            self.fill_seconds += fill_seconds
+        super().put(key, advice)
+
+    def stats(self) -> Dict:
+        stats = super().stats()
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["mean_lookup_us"] = self.lookup_seconds / lookups * 1e6 if lookups else 0.0
+        stats["mean_model_call_ms"] = self.fill_seconds / self.fills * 1000 if self.fills else 0.0
+        return stats
@@ -1,6 +1,4 @@
-import os
 from flask import Flask, render_template, request, redirect, url_for, jsonify
-from werkzeug.utils import secure_filename
 from flask_cors import CORS
 
 from resume_parser import ResumeParser
@@ -8,8 +6,6 @@ from gemini_integration import GeminiSkillsAdvisor
 
 app = Flask(__name__)
 app.secret_key = "your_secret_key"
-UPLOAD_FOLDER = "uploads"
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 CORS(app)  # Allow requests from Next.js
 
 resume_parser = ResumeParser()
@@ -27,11 +23,7 @@ def resume_parser_route():
     # Step 1: Upload and extract skills
     if step == 'skills' and 'resume' in request.files:
         file = request.files['resume']
-        filename = secure_filename(file.filename)
-        filepath = os.path.join(UPLOAD_FOLDER, filename)
-        file.save(filepath)
-        result = resume_parser.parse_resume(filepath)
-        os.remove(filepath)
+        result = resume_parser.parse_resume(file.stream, filename=file.filename)
         extracted_skills = result['categorized_skills'] if result else {}
         return render_template(
             'resume_parser.html',
@@ -107,10 +99,7 @@ def analyze_skills():
     if 'resume' not in request.files:
         return jsonify({'error': 'No file uploaded'}), 400
     file = request.files['resume']
-    filepath = f'tmp_{file.filename}'
-    file.save(filepath)
-    result = resume_parser.parse_resume(filepath)
-    os.remove(filepath)
+    result = resume_parser.parse_resume(file.stream, filename=file.filename)
     if not result:
         return jsonify({'error': 'Failed to extract skills'}), 500
     return jsonify({'categorized_skills': result['categorized_skills']})
@@ -0,0 +1,113 @@
+"""
+Recall and latency of the approximate cultural-match backend against exact search.
+
+    python -m benchmarks.culture_ann --companies 100000 --probes 5 10 20 40
+
+Builds a synthetic corpus by recombining sentences from merged_data.csv, fits one
+exact and one ANN CulturalMatcher on it, and for each n_probes setting reports
+recall@k against the exact top-k, mean candidates scored and query latency.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from culture_ann import recall_at_k
+from culturematch import CulturalMatcher
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def synthetic_companies(n: int, seed: int = 0, min_sentences: int = 4, max_sentences: int = 12) -> pd.DataFrame:
+    """Company texts made of random sentences drawn from the real culture data"""
+    source = pd.read_csv(os.path.join(REPO_ROOT, "merged_data.csv"))
+    sentences = [s.strip() for text in source["Text"].dropna() for s in re.split(r'(?<=[.!?])\s+', text) if len(s.strip()) > 20]
+    rng = np.random.default_rng(seed)
+    lengths = rng.integers(min_sentences, max_sentences + 1, n)
+    picks = rng.integers(0, len(sentences), lengths.sum())
+    texts, start = [], 0
+    for length in lengths:
+        texts.append(" ".join(sentences[i] for i in picks[start:start + length]))
+        start += length
+    return pd.DataFrame({"Company Name": [f"Company {i}" for i in range(n)], "Text": texts})
+
+
+def sample_queries(n: int, seed: int = 1) -> list:
+    phrases = [
+        "work life balance", "good pay and bonus", "remote work flexibility", "learning and growth",
+        "supportive management", "diverse inclusive culture", "innovation and impact", "job security",
+        "not too much politics", "great benefits and exposure", "fast paced startup", "collaborative teams",
+    ]
+    rng = np.random.default_rng(seed)
+    return [" ".join(rng.choice(phrases, size=rng.integers(1, 4), replace=False)) for _ in range(n)]
+
+
+def time_queries(fn, queries):
+    results, latencies = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(fn(query))
+        latencies.append(time.perf_counter() - start)
+    return results, np.array(latencies) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark ANN cultural matching against exact search')
+    parser.add_argument('--companies', type=int, default=100000, help='Synthetic corpus size')
+    parser.add_argument('--queries', type=int, default=200, help='Number of queries')
+    parser.add_argument('--top_n', type=int, default=10, help='k for recall@k')
+    parser.add_argument('--probes', type=int, nargs='+', default=[5, 10, 20, 40], help='n_probes values to sweep')
+    parser.add_argument('--components', type=int, default=256, help='SVD dimensions')
+    parser.add_argument('--lists', type=int, default=None, help='IVF lists (default: derived from --companies)')
+    parser.add_argument('--rerank', type=int, default=100, help='Candidates re-scored exactly, as a multiple of top_n')
+    parser.add_argument('--json', type=str, default=None, help='Also write the results to this file')
+    args = parser.parse_args()
+
+    data = synthetic_companies(args.companies)
+    queries = sample_queries(args.queries)
+
+    start = time.perf_counter()
+    matcher = CulturalMatcher(data=data, backend="ann", ann_params={
+        "n_components": args.components, "n_lists": args.lists, "rerank_factor": args.rerank,
+    })
+    build_seconds = time.perf_counter() - start
+    index = matcher.ann_index
+    transformed = [matcher.vectorizer.transform([q]) for q in queries]
+
+    def exact(user_tfidf):
+        return matcher.top_indices(matcher.score(user_tfidf), args.top_n)
+
+    exact_results, exact_ms = time_queries(exact, transformed)
+    rows = [{"mode": "exact", "recall": 1.0, "candidates": args.companies,
+             "p50_ms": float(np.percentile(exact_ms, 50)), "p95_ms": float(np.percentile(exact_ms, 95))}]
+
+    for n_probes in args.probes:
+        def approximate(user_tfidf):
+            found = index.search(matcher.tfidf_matrix, user_tfidf, args.top_n, n_probes)
+            return np.array([], dtype=np.intp) if found is None else found[0]
+
+        ann_results, ann_ms = time_queries(approximate, transformed)
+        candidates = [len(index.candidates(t, n_probes)) for t in transformed]
+        rows.append({"mode": f"ann n_probes={n_probes}", "recall": recall_at_k(exact_results, ann_results),
+                     "candidates": float(np.mean(candidates)),
+                     "p50_ms": float(np.percentile(ann_ms, 50)), "p95_ms": float(np.percentile(ann_ms, 95))})
+
+    print(f"{args.companies} companies, {index.lists.n_lists} lists, {args.queries} queries, k={args.top_n}, "
+          f"index build {build_seconds:.1f}s")
+    print(f"{'mode':<20}{'recall@k':>10}{'candidates':>12}{'p50 ms':>10}{'p95 ms':>10}")
+    for row in rows:
+        print(f"{row['mode']:<20}{row['recall']:>10.3f}{row['candidates']:>12.0f}{row['p50_ms']:>10.2f}{row['p95_ms']:>10.2f}")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({"companies": args.companies, "n_lists": index.lists.n_lists, "build_seconds": build_seconds,
+                       "results": rows}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+"""
+Reproducible synthetic resumes as PDF and DOCX, built from ResumeParser.technical_skills.
+
+    python -m benchmarks.resume_corpus --out resume_corpus --count 200 --lines 80 --skill_density 0.3
+
+Each resume mixes filler sentences with "Tools:" lines listing taxonomy skills.
+--lines sets the length and --skill_density the fraction of lines that list skills.
+The same seed always gives the same files. The PDF and DOCX writers are minimal and
+hand-written, so the corpus needs nothing beyond the standard library. manifest.json
+records each file's parameters and the skills that were planted in it.
+"""
+import argparse
+import json
+import os
+import sys
+import zipfile
+from typing import Dict, List
+from xml.sax.saxutils import escape
+
+import numpy as np
+
+from resume_parser import ResumeParser
+
+FILLER = [
+    "Worked closely with cross-functional teams to deliver features on schedule.",
+    "Led the migration of legacy services and mentored two junior engineers.",
+    "Improved reporting accuracy and reduced manual effort across the department.",
+    "Bachelor of Technology in Computer Science with a focus on distributed systems.",
+    "Presented quarterly results to stakeholders and gathered product requirements.",
+    "Owned the on-call rotation and cut incident response time by a third.",
+    "Designed onboarding material that shortened ramp-up for new hires.",
+    "Coordinated releases across three time zones with minimal downtime.",
+]
+
+LINES_PER_PAGE = 50
+
+
+def taxonomy_skills() -> List[str]:
+    parser = ResumeParser(nlp_mode="none")
+    return [skill for skill_list in parser.technical_skills.values() for skill in skill_list]
+
+
+def resume_lines(rng: np.random.Generator, skills: List[str], n_lines: int, skill_density: float):
+    """
+    Lines of one synthetic resume
+    Returns:
+        (lines, planted skills in first-appearance order)
+    """
+    lines, planted = [], {}
+    for _ in range(n_lines):
+        if rng.random() < skill_density:
+            picked = list(rng.choice(skills, size=int(rng.integers(1, 6)), replace=False))
+            planted.update(dict.fromkeys(picked))
+            lines.append("Tools: " + ", ".join(picked) + ".")
+        else:
+            lines.append(FILLER[rng.integers(len(FILLER))])
+    return lines, list(planted)
+
+
+def synthetic_texts(n: int, n_lines: int = 40, skill_density: float = 0.5, seed: int = 0) -> List[str]:
+    """Plain-text resumes, for benchmarks that start after text extraction"""
+    rng = np.random.default_rng(seed)
+    skills = taxonomy_skills()
+    return ["\n".join(resume_lines(rng, skills, n_lines, skill_density)[0]) for _ in range(n)]
+
+
+def _pdf_string(line: str) -> str:
+    """Line as a PDF literal string; non-Latin-1 characters are replaced"""
+    line = line.encode("latin-1", "replace").decode("latin-1")
+    return "(" + line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ")"
+
+
+def write_pdf(path: str, lines: List[str]) -> None:
+    """Minimal PDF 1.4: one Helvetica text object per line, LINES_PER_PAGE lines per page"""
+    pages = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)] or [[]]
+    n_pages = len(pages)
+    # Object numbers: 1 catalog, 2 page tree, 3 font, then a page and its content stream per page
+    objects = {
+        1: "<< /Type /Catalog /Pages 2 0 R >>",
+        2: "<< /Type /Pages /Kids [%s] /Count %d >>" % (" ".join(f"{4 + 2 * i} 0 R" for i in range(n_pages)), n_pages),
+        3: "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    }
+    for i, page_lines in enumerate(pages):
+        page_id, content_id = 4 + 2 * i, 5 + 2 * i
+        content = "\n".join(f"BT /F1 10 Tf 50 {800 - 15 * row} Td {_pdf_string(line)} Tj ET"
+                            for row, line in enumerate(page_lines))
+        objects[page_id] = (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+                            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>")
+        objects[content_id] = f"<< /Length {len(content.encode('latin-1'))} >>\nstream\n{content}\nendstream"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for number in sorted(objects):
+        offsets[number] = len(out)
+        out += f"{number} 0 obj\n{objects[number]}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for number in sorted(objects):
+        out += f"{offsets[number]:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+DOCX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+DOCX_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    '</Relationships>'
+)
+
+
+def write_docx(path: str, lines: List[str]) -> None:
+    """Minimal DOCX: one paragraph per line"""
+    paragraphs = "".join(f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>' for line in lines)
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f'<w:body>{paragraphs}</w:body></w:document>'
+    )
+    # Fixed timestamps keep the archive bytes identical across runs
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in (("[Content_Types].xml", DOCX_CONTENT_TYPES), ("_rels/.rels", DOCX_RELS),
+                           ("word/document.xml", document)):
+            archive.writestr(zipfile.ZipInfo(name, date_time=(1980, 1, 1, 0, 0, 0)), data)
+
+
+WRITERS = {"pdf": write_pdf, "docx": write_docx}
+
+
+def generate_corpus(out_dir: str, count: int, n_lines: int = 80, skill_density: float = 0.3,
+                    formats=("pdf", "docx"), seed: int = 0) -> List[Dict]:
+    """
+    Write count resumes, alternating between formats, and a manifest.json describing them
+    Returns:
+        list: Manifest entries ({"file", "format", "lines", "skills"})
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    skills = taxonomy_skills()
+    manifest = []
+    for i in range(count):
+        resume_format = formats[i % len(formats)]
+        lines, planted = resume_lines(rng, skills, n_lines, skill_density)
+        name = f"resume_{i:05d}.{resume_format}"
+        WRITERS[resume_format](os.path.join(out_dir, name), lines)
+        manifest.append({"file": name, "format": resume_format, "lines": n_lines, "skills": planted})
+
+    with open(os.path.join(out_dir, "manifest.json"), "w") as f:
+        json.dump({"seed": seed, "count": count, "lines": n_lines, "skill_density": skill_density,
+                   "resumes": manifest}, f, indent=2)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a reproducible synthetic resume corpus')
+    parser.add_argument('--out', type=str, default='resume_corpus', help='Directory to write the resumes to')
+    parser.add_argument('--count', type=int, default=200, help='Number of resumes')
+    parser.add_argument('--lines', type=int, default=80, help=f'Lines per resume ({LINES_PER_PAGE} per PDF page)')
+    parser.add_argument('--skill_density', type=float, default=0.3, help='Fraction of lines that list skills')
+    parser.add_argument('--formats', type=str, nargs='+', default=['pdf', 'docx'], choices=sorted(WRITERS))
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    args = parser.parse_args()
+
+    generate_corpus(args.out, args.count, args.lines, args.skill_density, tuple(args.formats), args.seed)
+    print(f"Wrote {args.count} resumes to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
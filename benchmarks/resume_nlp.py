@@ -0,0 +1,141 @@
+"""
+Load time, memory and per-resume latency of each ResumeParser NLP mode.
+
+    python -m benchmarks.resume_nlp --resumes resumes/*.pdf --exclude tagger parser ner lemmatizer
+
+Each configuration runs in a fresh process so model memory is not shared between
+them. Load time covers importing spaCy and loading the pipeline; memory is the RSS
+growth over that load plus the peak RSS after parsing. Latency is for
+process_text + extract_skills on pre-extracted text, so PDF/DOCX reading is left out.
+Without --resumes, synthetic resume texts come from benchmarks.resume_corpus.
+"""
+import argparse
+import json
+import multiprocessing
+import resource
+import sys
+import time
+from queue import Empty
+from typing import Dict, List
+
+import numpy as np
+
+from benchmarks.resume_corpus import synthetic_texts
+from resume_parser import ResumeParser, load_nlp
+
+
+def rss_mb() -> float:
+    """Current resident set size of this process"""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def run_config(mode: str, exclude: List[str], texts: List[str], repeats: int, queue) -> None:
+    """Child process body: load one configuration and time it over every text"""
+    before = rss_mb()
+    start = time.perf_counter()
+    try:
+        nlp = load_nlp(mode, exclude=exclude)
+    except Exception as e:
+        queue.put({"error": str(e)})
+        return
+    load_seconds = time.perf_counter() - start
+    load_mb = rss_mb() - before
+
+    parser = ResumeParser(nlp_mode="none")
+    parser.nlp, parser.nlp_mode = nlp, mode
+    latencies = []
+    for _ in range(repeats):
+        for text in texts:
+            start = time.perf_counter()
+            parser.extract_skills(parser.process_text(text))
+            latencies.append(time.perf_counter() - start)
+    latencies = np.array(latencies) * 1000
+
+    queue.put({
+        "mode": mode if not exclude else f"{mode} -{','.join(exclude)}",
+        "pipeline": list(nlp.pipe_names) if nlp is not None else [],
+        "load_seconds": load_seconds,
+        "load_mb": load_mb,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+        "resumes_per_second": 1000 / float(latencies.mean()),
+    })
+
+
+def measure(mode: str, exclude: List[str], texts: List[str], repeats: int, timeout: float = 1800) -> Dict:
+    """
+    Run one configuration in a fresh process
+    Raises:
+        RuntimeError: If the child reports an error, exits without a result (e.g. killed
+            for running out of memory) or takes longer than timeout seconds
+    """
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=run_config, args=(mode, exclude, texts, repeats, queue))
+    process.start()
+    deadline = time.monotonic() + timeout
+    try:
+        while True:
+            try:
+                result = queue.get(timeout=1.0)
+                break
+            except Empty:
+                if not process.is_alive():
+                    process.join()
+                    raise RuntimeError(f"benchmark process exited with code {process.exitcode} without a result")
+                if time.monotonic() > deadline:
+                    process.terminate()
+                    raise RuntimeError(f"benchmark process took longer than {timeout:g}s")
+    finally:
+        process.join()
+    if "error" in result:
+        raise RuntimeError(result["error"])
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare ResumeParser NLP modes')
+    parser.add_argument('--resumes', type=str, nargs='*', default=[], help='PDF/DOCX files to parse (default: synthetic texts)')
+    parser.add_argument('--synthetic', type=int, default=50, help='Synthetic texts to generate when no resumes are given')
+    parser.add_argument('--repeats', type=int, default=3, help='Passes over the texts per configuration')
+    parser.add_argument('--exclude', type=str, nargs='*', default=["tagger", "parser", "ner", "lemmatizer", "attribute_ruler"],
+                        help='Components left out of the trimmed full-pipeline configuration')
+    parser.add_argument('--timeout', type=float, default=1800, help='Seconds allowed per configuration')
+    parser.add_argument('--json', type=str, default=None, help='Also write the results to this file')
+    args = parser.parse_args()
+
+    if args.resumes:
+        extractor = ResumeParser(nlp_mode="none")
+        texts = [text for text in (extractor.extract_text(path) for path in args.resumes) if text]
+    else:
+        texts = synthetic_texts(args.synthetic)
+
+    configs = [("none", []), ("tokenizer", []), ("full", [])]
+    if args.exclude:
+        configs.append(("full", args.exclude))
+
+    results = []
+    for mode, exclude in configs:
+        try:
+            results.append(measure(mode, exclude, texts, args.repeats, args.timeout))
+        except Exception as e:
+            print(f"Skipping {mode}: {e}")
+
+    print(f"{len(texts)} resumes x {args.repeats} passes")
+    print(f"{'mode':<48}{'load s':>8}{'load MB':>9}{'peak MB':>9}{'p50 ms':>9}{'p95 ms':>9}{'resumes/s':>11}")
+    for r in results:
+        print(f"{r['mode']:<48}{r['load_seconds']:>8.2f}{r['load_mb']:>9.0f}{r['peak_rss_mb']:>9.0f}"
+              f"{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}{r['resumes_per_second']:>11.1f}")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
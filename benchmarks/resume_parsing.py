@@ -0,0 +1,162 @@
+"""
+Per-stage latency, throughput and peak memory of ResumeParser.
+
+    python -m benchmarks.resume_parsing --count 200 --lines 80 --json results/resume_parsing.json
+    python -m benchmarks.resume_parsing --corpus resume_corpus --nlp_mode full
+
+Generates a synthetic corpus with benchmarks.resume_corpus, unless --corpus points
+at an existing one. Each resume is parsed stage by stage, as parse_resume does:
+extract_text, the NLP pipeline (process_text), extract_skills and
+analyze_skill_match against a role. p50/p95/p99 are reported per stage and for the
+whole parse. Peak memory is the process high-water mark, plus the peak Python
+allocation measured with tracemalloc in a separate, untimed pass. The JSON output
+includes the git commit and settings, so runs can be compared across commits.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, List
+
+import numpy as np
+
+from benchmarks.resume_corpus import generate_corpus
+from resume_parser import NLP_MODES, DEFAULT_NLP_MODE, ResumeParser
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STAGES = ["extract_text", "nlp", "extract_skills", "analyze_skill_match", "total"]
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def summarize(seconds: List[float]) -> Dict:
+    ms = np.array(seconds) * 1000
+    return {
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "mean_ms": float(ms.mean()),
+    }
+
+
+def parse_stages(parser: ResumeParser, path: str, required_skills: List[str]):
+    """Parse one resume the way parse_resume does; returns (seconds per stage, categorized_skills)"""
+    t0 = time.perf_counter()
+    text = parser.extract_text(path)
+    t1 = time.perf_counter()
+    doc = parser.process_text(text)
+    t2 = time.perf_counter()
+    categorized_skills = parser.extract_skills(doc)
+    t3 = time.perf_counter()
+    parser.analyze_skill_match(categorized_skills, required_skills)
+    t4 = time.perf_counter()
+    return (t1 - t0, t2 - t1, t3 - t2, t4 - t3, t4 - t0), categorized_skills
+
+
+def run(parser: ResumeParser, corpus_dir: str, repeats: int, role: str) -> Dict:
+    """Time every stage over every resume in the corpus, then measure allocations in one untimed pass"""
+    with open(os.path.join(corpus_dir, "manifest.json")) as f:
+        manifest = json.load(f)
+    resumes = manifest["resumes"]
+    paths = [os.path.join(corpus_dir, resume["file"]) for resume in resumes]
+    required_skills = parser.job_roles_skills[role]
+
+    timings = {stage: [] for stage in STAGES}
+    planted = found = 0
+    start = time.perf_counter()
+    for repeat in range(repeats):
+        for resume, path in zip(resumes, paths):
+            seconds, categorized_skills = parse_stages(parser, path, required_skills)
+            for stage, value in zip(STAGES, seconds):
+                timings[stage].append(value)
+            if repeat == 0:
+                extracted = {skill for skills in categorized_skills.values() for skill in skills}
+                planted += len(resume["skills"])
+                found += len(set(resume["skills"]) & extracted)
+    elapsed = time.perf_counter() - start
+
+    # tracemalloc slows every allocation, so it only runs outside the timed passes
+    tracemalloc.start()
+    for path in paths:
+        parse_stages(parser, path, required_skills)
+    _, peak_traced = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "resumes": len(resumes),
+        "repeats": repeats,
+        "formats": sorted({resume["format"] for resume in resumes}),
+        "lines": manifest.get("lines"),
+        "skill_density": manifest.get("skill_density"),
+        "stages": {stage: summarize(timings[stage]) for stage in STAGES},
+        "resumes_per_second": len(timings["total"]) / elapsed,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "peak_python_alloc_mb": peak_traced / 1024 / 1024,
+        # Share of the skills planted by the generator that extract_skills found
+        "planted_skill_recall": found / planted if planted else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark ResumeParser stage by stage on a synthetic corpus')
+    parser.add_argument('--corpus', type=str, default=None, help='Existing corpus directory (default: generate one)')
+    parser.add_argument('--count', type=int, default=200, help='Resumes to generate')
+    parser.add_argument('--lines', type=int, default=80, help='Lines per generated resume')
+    parser.add_argument('--skill_density', type=float, default=0.3, help='Fraction of generated lines that list skills')
+    parser.add_argument('--formats', type=str, nargs='+', default=['pdf', 'docx'], help='Generated formats')
+    parser.add_argument('--seed', type=int, default=0, help='Corpus seed')
+    parser.add_argument('--repeats', type=int, default=3, help='Passes over the corpus')
+    parser.add_argument('--role', type=str, default='Data Scientist', help='Role for analyze_skill_match')
+    parser.add_argument('--nlp_mode', type=str, default=DEFAULT_NLP_MODE, choices=NLP_MODES, help='spaCy pipeline mode')
+    parser.add_argument('--json', type=str, default=None, help='Also write the results to this file')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    resume_parser = ResumeParser(nlp_mode=args.nlp_mode)
+    load_seconds = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as scratch:
+        corpus_dir = args.corpus
+        if corpus_dir is None:
+            corpus_dir = scratch
+            generate_corpus(corpus_dir, args.count, args.lines, args.skill_density, tuple(args.formats), args.seed)
+        results = run(resume_parser, corpus_dir, args.repeats, args.role)
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "nlp_mode": resume_parser.nlp_mode,
+        "pdf_backend": resume_parser.pdf_extractor.backend.name,
+        "corpus": args.corpus or {"generated": True, "seed": args.seed},
+        "parser_load_seconds": load_seconds,
+        **results,
+    }
+
+    print(f"commit {report['commit']}, nlp_mode={report['nlp_mode']}, pdf backend {report['pdf_backend']}, "
+          f"{results['resumes']} resumes x {results['repeats']} passes")
+    print(f"{'stage':<22}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'mean ms':>9}")
+    for stage, row in results["stages"].items():
+        print(f"{stage:<22}{row['p50_ms']:>9.3f}{row['p95_ms']:>9.3f}{row['p99_ms']:>9.3f}{row['mean_ms']:>9.3f}")
+    print(f"{results['resumes_per_second']:.1f} resumes/s, peak RSS {results['peak_rss_mb']:.0f}MB, "
+          f"peak Python allocations {results['peak_python_alloc_mb']:.1f}MB")
+    if args.json:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
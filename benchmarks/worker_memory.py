@@ -0,0 +1,164 @@
+"""
+Measure per-worker memory of the API under gunicorn with and without preloading.
+
+    python -m benchmarks.worker_memory --workers 4
+
+Starts gunicorn twice (NEXTLEAP_PRELOAD=0, then 1), waits for every subsystem to
+finish loading and for worker memory to settle, then reads RSS and PSS for each
+worker, and for the resume parse-pool processes each worker starts, from
+/proc/<pid>/smaps_rollup. PSS divides shared pages between the processes mapping
+them, so its sum is the real footprint of the server.
+Linux only.
+"""
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from typing import Dict, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def read_memory_kb(pid: int) -> Dict[str, int]:
+    """Rss, Pss, Shared_* and Private_* totals for a process, in kB"""
+    memory = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                memory[parts[0].rstrip(':')] = int(parts[1])
+    return memory
+
+
+def child_pids(parent: int) -> List[int]:
+    """PIDs whose parent is the given process"""
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # The command name may contain spaces, so split after its closing parenthesis
+        fields = stat.rsplit(')', 1)[1].split()
+        if int(fields[1]) == parent:
+            children.append(int(entry))
+    return sorted(children)
+
+
+def is_resource_tracker(pid: int) -> bool:
+    """multiprocessing's helper process, started next to a spawned pool"""
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            return b"resource_tracker" in f.read()
+    except OSError:
+        return False
+
+
+def wait_until_loaded(url: str, timeout: float) -> None:
+    """Wait until /ready shows every subsystem either ready or failed (e.g. no Gemini key)"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=2) as response:
+                body = json.load(response)
+        except urllib.error.HTTPError as e:
+            body = json.load(e)
+        except (urllib.error.URLError, ConnectionError, OSError):
+            body = None
+        if body and all(s["state"] in ("ready", "failed") for s in body["subsystems"].values()):
+            return
+        time.sleep(1)
+    raise TimeoutError(f"{url} did not finish loading within {timeout}s")
+
+
+def wait_until_settled(pids: List[int], interval: float = 3.0, tolerance_kb: int = 2048, timeout: float = 600) -> None:
+    """Wait until no worker's RSS moves by more than tolerance between two samples"""
+    deadline = time.monotonic() + timeout
+    previous = None
+    while time.monotonic() < deadline:
+        current = [read_memory_kb(pid)["Rss"] for pid in pids]
+        if previous is not None and all(abs(a - b) <= tolerance_kb for a, b in zip(current, previous)):
+            return
+        previous = current
+        time.sleep(interval)
+
+
+def measure(preload: bool, workers: int, port: int, timeout: float) -> Dict:
+    """Run gunicorn in one mode and collect per-worker memory"""
+    env = dict(os.environ, NEXTLEAP_PRELOAD="1" if preload else "0", WEB_CONCURRENCY=str(workers), BIND=f"127.0.0.1:{port}")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "main:app"],
+        cwd=REPO_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        # Each worker loads in the background without preload; poll /ready once per worker
+        # so the requests are spread across them before measuring.
+        for _ in range(workers):
+            wait_until_loaded(f"http://127.0.0.1:{port}/ready", timeout)
+        pids = child_pids(server.pid)
+        wait_until_settled(pids)
+
+        per_worker = {pid: read_memory_kb(pid) for pid in pids}
+        pool = [read_memory_kb(pid) for worker in pids for pid in child_pids(worker) if not is_resource_tracker(pid)]
+        master = read_memory_kb(server.pid)
+        return {
+            "preload": preload,
+            "workers": len(pids),
+            "master_rss_mb": master["Rss"] / 1024,
+            "worker_rss_mb": [m["Rss"] / 1024 for m in per_worker.values()],
+            "worker_pss_mb": [m["Pss"] / 1024 for m in per_worker.values()],
+            "worker_private_mb": [(m.get("Private_Clean", 0) + m.get("Private_Dirty", 0)) / 1024 for m in per_worker.values()],
+            "pool_processes": len(pool),
+            "pool_pss_mb": sum(m["Pss"] for m in pool) / 1024,
+            "total_pss_mb": (master["Pss"] + sum(m["Pss"] for m in per_worker.values())
+                             + sum(m["Pss"] for m in pool)) / 1024,
+        }
+    finally:
+        server.send_signal(signal.SIGTERM)
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+
+def print_report(results: List[Dict]) -> None:
+    print(f"{'mode':<10}{'workers':>8}{'RSS/worker':>13}{'PSS/worker':>13}{'private/worker':>16}"
+          f"{'pool procs':>12}{'pool PSS':>11}{'total PSS':>12}")
+    for r in results:
+        mode = "preload" if r["preload"] else "per-worker"
+        n = max(r["workers"], 1)
+        print(f"{mode:<10}{r['workers']:>8}"
+              f"{sum(r['worker_rss_mb']) / n:>11.0f}MB"
+              f"{sum(r['worker_pss_mb']) / n:>11.0f}MB"
+              f"{sum(r['worker_private_mb']) / n:>14.0f}MB"
+              f"{r['pool_processes']:>12}"
+              f"{r['pool_pss_mb']:>9.0f}MB"
+              f"{r['total_pss_mb']:>10.0f}MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare per-worker memory with and without preloaded shared models')
+    parser.add_argument('--workers', type=int, default=4, help='Number of gunicorn workers')
+    parser.add_argument('--port', type=int, default=8765, help='Port to bind the server to')
+    parser.add_argument('--timeout', type=float, default=600, help='Seconds to wait for the server to become ready')
+    parser.add_argument('--json', type=str, default=None, help='Also write the raw results to this file')
+    args = parser.parse_args()
+
+    results = [measure(preload, args.workers, args.port, args.timeout) for preload in (False, True)]
+    print_report(results)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,6 @@
 import pandas as pd
-import numpy as np
-import random
-import gym
-from gym import spaces
 from sklearn.preprocessing import LabelEncoder
+from career_model import train_q_table_batched
 
 df = pd.read_csv("career_dataset.csv")
 
@@ -83,39 +80,7 @@ for col in ['current_role', 'next_role', 'education_level']:
 role_name_map = {name.lower(): name for name in encoders['current_role'].classes_}
 edu_name_map = {name.lower(): name for name in encoders['education_level'].classes_}
 
-class CareerEnv(gym.Env):
-    def __init__(self, data):
-        super(CareerEnv, self).__init__()
-        self.data = data
-        self.max_steps = len(data) - 1
-        self.observation_space = spaces.Box(low=0, high=100, shape=(4,), dtype=np.float32)
-        self.action_space = spaces.Discrete(data['next_role'].nunique())
-    def reset(self):
-        self.current_step = random.randint(0, self.max_steps)
-        row = self.data.iloc[self.current_step]
-        return np.array([row['current_role'], row['years_experience'], row['education_level'], row['current_salary_LPA']], dtype=np.float32)
-    def step(self, action):
-        row = self.data.iloc[self.current_step]
-        reward = 0
-        done = True
-        if action == row['next_role']:
-            increase = row['predicted_salary_LPA'] - row['current_salary_LPA']
-            reward = increase if increase > 0 else 0
-        next_state = self.reset()
-        return next_state, reward, done, {}
-
-env = CareerEnv(df)
-q_table = np.zeros((df['current_role'].nunique(), env.action_space.n))
-alpha, gamma, epsilon = 0.1, 0.6, 0.1
-episodes = 10000
-
-for _ in range(episodes):
-    state = env.reset()
-    current_role = int(state[0])
-    action = env.action_space.sample() if random.uniform(0, 1) < epsilon else np.argmax(q_table[current_role])
-    next_state, reward, _, _ = env.step(action)
-    next_role = int(next_state[0])
-    q_table[current_role, action] = (1 - alpha) * q_table[current_role, action] + alpha * (reward + gamma * np.max(q_table[next_role]))
+q_table = train_q_table_batched(df, episodes=10000)
 
 user_role = input("Enter your current role (or type 'Fresher'): ").strip().lower()
 
@@ -0,0 +1,578 @@
+import hashlib
+import logging
+import os
+import random
+import sys
+import argparse
+
+import gym
+import joblib
+import numpy as np
+import pandas as pd
+from gym import spaces
+from scipy import sparse
+from sklearn.preprocessing import LabelEncoder
+
+from career_snapshot import SNAPSHOT_DIR, read_metadata, load_snapshot, load_skill_lists, split_skill_lists
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DATASET_PATH = "career_dataset.csv"
+ARTIFACT_PATH = "career_model.joblib"
+ARTIFACT_VERSION = 1
+
+ENCODED_COLUMNS = ['current_role', 'next_role', 'education_level']
+
+# Q-learning hyperparameters
+ALPHA, GAMMA, EPSILON = 0.1, 0.6, 0.1
+
+domain_mapping = {
+    "Software Engineer": "Software Development",
+    "Full Stack Developer": "Software Development",
+    "Front-End Developer (React, Angular, etc.)": "Software Development",
+    "Back-End Developer (Node.js, Django, Spring Boot, etc.)": "Software Development",
+    "Mobile App Developer (Android/iOS)": "Software Development",
+    "DevOps Engineer": "Software Development",
+    "Site Reliability Engineer (SRE)": "Software Development",
+    "Embedded Software Engineer": "Software Development",
+    "Game Developer": "Software Development",
+    "API Developer": "Software Development",
+    "Software Architect": "Software Development",
+    "Cloud Developer (AWS/GCP/Azure)": "Software Development",
+    "Data Scientist": "Data Science & Analytics",
+    "Data Analyst": "Data Science & Analytics",
+    "Business Intelligence Analyst": "Data Science & Analytics",
+    "Machine Learning Engineer": "Data Science & Analytics",
+    "Data Engineer": "Data Science & Analytics",
+    "Big Data Engineer": "Data Science & Analytics",
+    "Decision Scientist": "Data Science & Analytics",
+    "AI/ML Research Scientist": "Data Science & Analytics",
+    "NLP Engineer": "Data Science & Analytics",
+    "Deep Learning Engineer": "Data Science & Analytics",
+    "Computer Vision Engineer": "Data Science & Analytics",
+    "MLOps Engineer": "Data Science & Analytics",
+    "Cybersecurity Analyst": "Cybersecurity",
+    "Security Engineer": "Cybersecurity",
+    "Ethical Hacker": "Cybersecurity",
+    "Security Architect": "Cybersecurity",
+    "Network Security Engineer": "Cybersecurity",
+    "SOC Analyst": "Cybersecurity",
+    "Information Security Analyst": "Cybersecurity",
+    "Cryptographer": "Cybersecurity",
+    "Cloud Solutions Architect": "Cloud & Infrastructure",
+    "Cloud Engineer": "Cloud & Infrastructure",
+    "System Administrator": "Cloud & Infrastructure",
+    "Network Engineer": "Cloud & Infrastructure",
+    "IT Infrastructure Engineer": "Cloud & Infrastructure",
+    "Database Administrator (DBA)": "Cloud & Infrastructure",
+    "Virtualization Engineer": "Cloud & Infrastructure",
+    "Storage Engineer": "Cloud & Infrastructure",
+    "Technical Support Engineer": "IT Support & Systems",
+    "IT Support Specialist": "IT Support & Systems",
+    "Help Desk Technician": "IT Support & Systems",
+    "System Support Engineer": "IT Support & Systems",
+    "Desktop Support Engineer": "IT Support & Systems",
+    "QA Engineer": "Testing & Quality Assurance",
+    "Automation Test Engineer": "Testing & Quality Assurance",
+    "Manual Test Engineer": "Testing & Quality Assurance",
+    "Performance Tester": "Testing & Quality Assurance",
+    "SDET": "Testing & Quality Assurance",
+    "Test Architect": "Testing & Quality Assurance",
+    "UI Developer": "UI/UX and Web Technology",
+    "UX Designer": "UI/UX and Web Technology",
+    "AI Research Scientist": "AI Research & Emerging Tech",
+    "Robotics Engineer": "AI Research & Emerging Tech",
+    "Quantum Computing Researcher": "AI Research & Emerging Tech",
+    "Blockchain Developer": "AI Research & Emerging Tech",
+    "AR/VR Developer": "AI Research & Emerging Tech",
+    "Computer Vision Researcher": "AI Research & Emerging Tech",
+    "Technical Program Manager (TPM)": "Technical Management & Consulting",
+    "Engineering Manager": "Technical Management & Consulting",
+    "Product Manager (Technical)": "Technical Management & Consulting"
+}
+
+
+class CareerEnv(gym.Env):
+    def __init__(self, data):
+        super().__init__()
+        self.data = data
+        self.max_steps = len(data) - 1
+        self.observation_space = spaces.Box(low=0, high=100, shape=(4,), dtype=np.float32)
+        self.action_space = spaces.Discrete(data['next_role'].nunique())
+
+    def reset(self):
+        self.current_step = random.randint(0, self.max_steps)
+        row = self.data.iloc[self.current_step]
+        return np.array([row['current_role'], row['years_experience'], row['education_level'], row['current_salary_LPA']], dtype=np.float32)
+
+    def step(self, action):
+        row = self.data.iloc[self.current_step]
+        reward = 0
+        done = True
+        if action == row['next_role']:
+            increase = row['predicted_salary_LPA'] - row['current_salary_LPA']
+            reward = increase if increase > 0 else 0
+        next_state = self.reset()
+        return next_state, reward, done, {}
+
+
+def load_career_data(data_path: str = DATASET_PATH, snapshot_dir: str = SNAPSHOT_DIR) -> pd.DataFrame:
+    """
+    Load the career dataset, preferring its compiled columnar snapshot
+    The snapshot is used when it was compiled from the current CSV (or the CSV
+    is absent); otherwise the CSV is parsed as text.
+    Args:
+        data_path: Path to the career dataset CSV
+        snapshot_dir: Snapshot directory from career_snapshot.py, or None to always parse the CSV
+    Returns:
+        DataFrame with the raw (unencoded) role and education columns
+    """
+    metadata = read_metadata(snapshot_dir) if snapshot_dir else None
+    if metadata is not None:
+        if not os.path.exists(data_path) or metadata.get("dataset_sha256") == dataset_checksum(data_path):
+            logger.info(f"Loading career data from snapshot {snapshot_dir}")
+            return load_snapshot(snapshot_dir, metadata)
+        logger.info("Ignoring career snapshot compiled from a different dataset")
+
+    df = pd.read_csv(data_path)
+    df['skills'] = df['skills'].fillna('')
+    df['skills_to_learn'] = df['skills_to_learn'].fillna('')
+    return df
+
+
+def dataset_checksum(data_path: str = DATASET_PATH) -> str:
+    """SHA-256 of the dataset file, used to detect a stale artifact"""
+    digest = hashlib.sha256()
+    with open(data_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fit_encoders(df: pd.DataFrame) -> dict:
+    """Fit one LabelEncoder per categorical column of the raw dataset"""
+    encoders = {}
+    for col in ENCODED_COLUMNS:
+        le = LabelEncoder()
+        le.fit(df[col])
+        encoders[col] = le
+    return encoders
+
+
+def encoders_from_classes(encoder_classes: dict) -> dict:
+    """Rebuild fitted LabelEncoders from the classes stored in an artifact"""
+    encoders = {}
+    for col, classes in encoder_classes.items():
+        le = LabelEncoder()
+        le.classes_ = classes
+        encoders[col] = le
+    return encoders
+
+
+def prepare_career_data(df: pd.DataFrame, encoders: dict, mapping: dict) -> pd.DataFrame:
+    """
+    Add the domain column and label-encode the categorical columns in place
+    Args:
+        df: Raw career dataset from load_career_data
+        encoders: Fitted encoders keyed by column name
+        mapping: Role name to domain mapping
+    Returns:
+        The same DataFrame, encoded
+    """
+    df['domain'] = df['next_role'].map(mapping)
+    for col in ENCODED_COLUMNS:
+        codes = encoders[col].transform(df[col])
+        df[col] = codes.astype(np.int16 if len(encoders[col].classes_) < np.iinfo(np.int16).max else np.int32)
+    return df
+
+
+def build_transition_index(df: pd.DataFrame, encoders: dict, n_actions: int) -> dict:
+    """
+    Precompute per-next_role lookups so recommendations never scan the DataFrame
+    Each next_role is represented by its first row in the dataset, which is the
+    row the recommendation endpoint has always reported. Since the domain is a
+    function of next_role, a (domain, next_role) pair is a domain mask over actions.
+    Args:
+        df: Encoded career dataset from prepare_career_data
+        encoders: Fitted encoders keyed by column name
+        n_actions: Number of Q-table columns
+    Returns:
+        Dict of action-indexed arrays and per-domain action masks
+    """
+    first_rows = df.drop_duplicates('next_role')
+    actions = first_rows['next_role'].to_numpy(dtype=np.intp)
+    in_range = actions < n_actions
+    actions = actions[in_range]
+    first_rows = first_rows[in_range]
+
+    # Salaries have two decimals in the source data; rounding undoes float32 storage error
+    salary = np.full(n_actions, np.nan)
+    salary[actions] = np.round(first_rows['predicted_salary_LPA'].to_numpy(dtype=float), 2)
+    skills_to_learn = np.full(n_actions, '', dtype=object)
+    skills_to_learn[actions] = first_rows['skills_to_learn'].to_numpy(dtype=object)
+    role_names = np.asarray(encoders['next_role'].classes_[:n_actions], dtype=object)
+
+    domain_masks = {}
+    for domain, action in zip(first_rows['domain'], actions):
+        if pd.isna(domain):
+            continue
+        mask = domain_masks.setdefault(domain, np.zeros(n_actions, dtype=bool))
+        mask[action] = True
+
+    return {
+        "salary": salary,
+        "skills_to_learn": skills_to_learn,
+        "role_names": role_names,
+        "domain_masks": domain_masks,
+    }
+
+
+def top_k_indices(scores: np.ndarray, candidates: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores among candidates, highest first
+    Ties keep candidate order, matching a stable descending sort.
+    Args:
+        scores: Score per index
+        candidates: Indices eligible for selection, in ascending order
+        k: Number of indices to return
+    Returns:
+        Up to k indices into scores
+    """
+    if len(candidates) > k:
+        kth = np.partition(scores[candidates], len(candidates) - k)[len(candidates) - k]
+        candidates = candidates[scores[candidates] >= kth]
+    order = np.argsort(-scores[candidates], kind='stable')
+    return candidates[order[:k]]
+
+
+def rank_transitions(transition_index: dict, q_table: np.ndarray, encoded_roles: np.ndarray,
+                     domains: list, user_salaries: np.ndarray, k: int = 2):
+    """
+    Top-k next roles for a batch of profiles in one pass over the Q-table
+    A next role is eligible when it is in the profile's domain, pays more than the
+    profile's salary and its index differs from the encoded current role. Eligible
+    roles are ranked by Q-value, ties in action order.
+    Args:
+        transition_index: Index from build_transition_index
+        q_table: Trained Q-table
+        encoded_roles: Encoded current role per profile
+        domains: Domain name (or None) per profile
+        user_salaries: Current salary per profile
+        k: Number of roles to return per profile
+    Returns:
+        (actions, valid): (batch, k) arrays of ranked action indices and whether each is eligible
+    """
+    n_actions = q_table.shape[1]
+    encoded_roles = np.asarray(encoded_roles, dtype=np.intp)
+    user_salaries = np.asarray(user_salaries, dtype=float)
+
+    no_domain = np.zeros(n_actions, dtype=bool)
+    valid = np.stack([transition_index["domain_masks"].get(domain, no_domain) for domain in domains])
+    valid &= transition_index["salary"][None, :] > user_salaries[:, None]
+    own_action = encoded_roles < n_actions
+    valid[np.flatnonzero(own_action), encoded_roles[own_action]] = False
+
+    scores = np.where(valid, q_table[encoded_roles], -np.inf)
+    actions = np.argsort(-scores, axis=1, kind='stable')[:, :k]
+    return actions, np.take_along_axis(valid, actions, axis=1)
+
+
+def build_skill_index(df: pd.DataFrame, encoders: dict) -> dict:
+    """
+    Parse skills_to_learn once into a sparse row x skill-vocabulary matrix
+    A DataFrame loaded from a snapshot uses the skill lists split when it was compiled.
+    Args:
+        df: Encoded career dataset from prepare_career_data
+        encoders: Fitted encoders keyed by column name
+    Returns:
+        Dict with the lowercase vocabulary, the CSR incidence matrix and the
+        per-row fields the fresher endpoint reports
+    """
+    if "snapshot" in df.attrs:
+        # Read into memory: the CSR matrix below sorts and dedupes its index arrays in place
+        vocab, indptr, ids = load_skill_lists('skills_to_learn', df.attrs["snapshot"], mmap_mode=None)
+        vocab = vocab.astype(object)
+    else:
+        vocab = {}
+        indptr, ids = split_skill_lists((str(value).lower() for value in df['skills_to_learn']), vocab)
+        vocab = np.asarray(list(vocab), dtype=object)
+    matrix = sparse.csr_matrix(
+        (np.ones(len(ids), dtype=np.float32), ids, indptr),
+        shape=(len(df), len(vocab))
+    )
+    matrix.sum_duplicates()
+    matrix.data[:] = 1
+
+    next_roles = df['next_role'].to_numpy(dtype=np.intp)
+    role_names = np.asarray(encoders['next_role'].classes_, dtype=object)
+    # Rows whose next_role is missing in the dataset cannot be recommended
+    known_role = np.array([isinstance(name, str) for name in role_names])[next_roles]
+
+    return {
+        "vocab": vocab,
+        "matrix": matrix,
+        "next_role": next_roles,
+        "known_role": known_role,
+        "role_names": role_names,
+        "skills_to_learn": df['skills_to_learn'].to_numpy(dtype=object),
+        "salary": np.round(df['predicted_salary_LPA'].to_numpy(dtype=float), 2),
+    }
+
+
+def skill_match_counts(skill_index: dict, skills: list) -> np.ndarray:
+    """
+    Count, per dataset row, how many of the given skills its skills_to_learn mentions
+    A skill matches a row when it is a substring of one of the row's skills,
+    so "java" still matches "JavaScript" as the original per-row text search did.
+    Args:
+        skill_index: Index from build_skill_index
+        skills: Lowercase skill names
+    Returns:
+        Match count per row
+    """
+    vocab_ids, cols = [], []
+    for col, skill in enumerate(skills):
+        for vocab_id, term in enumerate(skill_index["vocab"]):
+            if skill in term:
+                vocab_ids.append(vocab_id)
+                cols.append(col)
+    query = sparse.csc_matrix(
+        (np.ones(len(vocab_ids), dtype=np.float32), (vocab_ids, cols)),
+        shape=(len(skill_index["vocab"]), len(skills))
+    )
+    hits = skill_index["matrix"] @ query
+    return np.asarray((hits > 0).sum(axis=1)).ravel()
+
+
+def train_q_table(df: pd.DataFrame, episodes: int = 10000, seed: int = None) -> np.ndarray:
+    """
+    Train the career transition Q-table by stepping CareerEnv one episode at a time
+    Args:
+        df: Encoded career dataset
+        episodes: Number of single-step episodes to run
+        seed: Optional seed for the episode and exploration RNGs
+    Returns:
+        Q-table of shape (current roles, next roles)
+    """
+    env = CareerEnv(df)
+    if seed is not None:
+        random.seed(seed)
+        env.action_space.seed(seed)
+    q_table = np.zeros((df['current_role'].nunique(), env.action_space.n))
+
+    for _ in range(episodes):
+        state = env.reset()
+        current_role = int(state[0])
+        action = env.action_space.sample() if random.uniform(0, 1) < EPSILON else np.argmax(q_table[current_role])
+        next_state, reward, _, _ = env.step(action)
+        next_role = int(next_state[0])
+        q_table[current_role, action] = (1 - ALPHA) * q_table[current_role, action] + ALPHA * (reward + GAMMA * np.max(q_table[next_role]))
+
+    return q_table
+
+
+def _apply_batch_updates(q_table: np.ndarray, cells: np.ndarray, targets: np.ndarray) -> None:
+    """
+    Apply a batch of Q-learning updates in place, in episode order
+    Repeated updates to the same cell compound exactly as they would sequentially:
+    after n updates the old value is scaled by (1 - alpha)^n and the i-th target
+    carries weight alpha * (1 - alpha)^(n - 1 - i).
+    Args:
+        q_table: Q-table to update
+        cells: Flat (state * n_actions + action) index of each episode
+        targets: reward + gamma * max Q(next state) of each episode
+    """
+    order = np.argsort(cells, kind='stable')
+    cells = cells[order]
+    targets = targets[order]
+
+    unique_cells, starts, counts = np.unique(cells, return_index=True, return_counts=True)
+    group = np.repeat(np.arange(len(unique_cells)), counts)
+    remaining = np.repeat(starts + counts, counts) - 1 - np.arange(len(cells))
+
+    decay = 1 - ALPHA
+    contributions = np.bincount(group, weights=ALPHA * decay ** remaining * targets, minlength=len(unique_cells))
+    flat = q_table.reshape(-1)
+    flat[unique_cells] = flat[unique_cells] * decay ** counts + contributions
+
+
+def train_q_table_batched(df: pd.DataFrame, episodes: int = 10000, seed: int = None, batch_size: int = 1024) -> np.ndarray:
+    """
+    Train the same Q-table as train_q_table, many episodes at a time
+    The dataset columns are extracted to NumPy arrays once and each batch of
+    episodes is sampled, acted on and applied with array operations. Actions
+    and targets within a batch use the Q-table as it was at the batch start.
+    Args:
+        df: Encoded career dataset
+        episodes: Number of single-step episodes to run
+        seed: Optional seed for the episode and exploration RNG
+        batch_size: Episodes sampled per update step
+    Returns:
+        Q-table of shape (current roles, next roles)
+    """
+    rng = np.random.default_rng(seed)
+    roles = df['current_role'].to_numpy(dtype=np.intp)
+    next_roles = df['next_role'].to_numpy(dtype=np.intp)
+    rewards = np.maximum(df['predicted_salary_LPA'].to_numpy(dtype=float) - df['current_salary_LPA'].to_numpy(dtype=float), 0)
+
+    n_rows = len(df)
+    n_actions = df['next_role'].nunique()
+    q_table = np.zeros((df['current_role'].nunique(), n_actions))
+
+    done = 0
+    while done < episodes:
+        size = min(batch_size, episodes - done)
+        rows = rng.integers(0, n_rows, size)
+        states = roles[rows]
+
+        explore = rng.random(size) < EPSILON
+        actions = np.where(explore, rng.integers(0, n_actions, size), q_table[states].argmax(axis=1))
+        reward = np.where(actions == next_roles[rows], rewards[rows], 0.0)
+
+        next_states = roles[rng.integers(0, n_rows, size)]
+        targets = reward + GAMMA * q_table[next_states].max(axis=1)
+
+        _apply_batch_updates(q_table, states * n_actions + actions, targets)
+        done += size
+
+    return q_table
+
+
+TRAINERS = {
+    "env": train_q_table,
+    "batched": train_q_table_batched,
+}
+
+
+def build_model(encoders: dict, q_table: np.ndarray, mapping: dict, checksum: str, episodes: int, trainer: str) -> dict:
+    """Assemble the in-memory model dict that main.py serves from"""
+    return {
+        "version": ARTIFACT_VERSION,
+        "dataset_sha256": checksum,
+        "episodes": episodes,
+        "trainer": trainer,
+        "q_table": q_table,
+        "encoders": encoders,
+        "role_name_map": {name.lower(): name for name in encoders['current_role'].classes_},
+        "edu_name_map": {name.lower(): name for name in encoders['education_level'].classes_},
+        "domain_mapping": dict(mapping),
+    }
+
+
+def train_model(data_path: str = DATASET_PATH, episodes: int = 10000, trainer: str = "batched", seed: int = None) -> dict:
+    """
+    Fit encoders and train the Q-table from the dataset on disk
+    Args:
+        data_path: Path to the career dataset CSV
+        episodes: Number of training episodes
+        trainer: Key into TRAINERS
+        seed: Optional RNG seed for reproducible training
+    Returns:
+        Model dict
+    """
+    df = load_career_data(data_path)
+    encoders = fit_encoders(df)
+    prepare_career_data(df, encoders, domain_mapping)
+    q_table = TRAINERS[trainer](df, episodes, seed=seed)
+    return build_model(encoders, q_table, domain_mapping, dataset_checksum(data_path), episodes, trainer)
+
+
+def save_artifact(model: dict, artifact_path: str = ARTIFACT_PATH) -> None:
+    """
+    Write the model to a single versioned artifact file
+    Args:
+        model: Model dict from train_model
+        artifact_path: Destination file, replaced atomically
+    """
+    payload = {
+        "version": model["version"],
+        "dataset_sha256": model["dataset_sha256"],
+        "episodes": model["episodes"],
+        "trainer": model.get("trainer"),
+        "q_table": model["q_table"],
+        "encoder_classes": {col: le.classes_ for col, le in model["encoders"].items()},
+        "role_name_map": model["role_name_map"],
+        "edu_name_map": model["edu_name_map"],
+        "domain_mapping": model["domain_mapping"],
+    }
+    tmp_path = f"{artifact_path}.{os.getpid()}.tmp"
+    joblib.dump(payload, tmp_path)
+    os.replace(tmp_path, artifact_path)
+    logger.info(f"Saved career model artifact to {artifact_path}")
+
+
+def load_artifact(artifact_path: str = ARTIFACT_PATH, checksum: str = None, mmap_mode: str = 'r'):
+    """
+    Load a model artifact if it exists and matches the expected dataset
+    Args:
+        artifact_path: Artifact written by save_artifact
+        checksum: Expected dataset SHA-256, or None to skip the check
+        mmap_mode: Passed to joblib.load so the Q-table is memory-mapped and its
+            pages are shared by every worker reading the same file; None copies it
+    Returns:
+        Model dict, or None if the artifact is missing, stale or unreadable
+    """
+    if not os.path.exists(artifact_path):
+        return None
+    try:
+        payload = joblib.load(artifact_path, mmap_mode=mmap_mode)
+    except Exception as e:
+        logger.warning(f"Could not read career model artifact {artifact_path}: {e}")
+        return None
+
+    if payload.get("version") != ARTIFACT_VERSION:
+        logger.info(f"Ignoring career model artifact with version {payload.get('version')}")
+        return None
+    if checksum is not None and payload.get("dataset_sha256") != checksum:
+        logger.info("Ignoring career model artifact trained on a different dataset")
+        return None
+
+    model = dict(payload)
+    model["encoders"] = encoders_from_classes(model.pop("encoder_classes"))
+    return model
+
+
+def load_or_train(data_path: str = DATASET_PATH, artifact_path: str = ARTIFACT_PATH) -> dict:
+    """
+    Load the persisted model, training and saving a fresh one only if needed
+    Args:
+        data_path: Path to the career dataset CSV
+        artifact_path: Path to the model artifact
+    Returns:
+        Model dict
+    """
+    model = load_artifact(artifact_path, dataset_checksum(data_path))
+    if model is not None:
+        logger.info(f"Loaded career model artifact from {artifact_path}")
+        return model
+
+    logger.info("No usable career model artifact, training at startup")
+    model = train_model(data_path)
+    try:
+        save_artifact(model, artifact_path)
+    except OSError as e:
+        logger.warning(f"Could not save career model artifact: {e}")
+    return model
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Train the career transition model and save it as an artifact')
+    parser.add_argument('--data', type=str, default=DATASET_PATH, help='Path to the career dataset CSV')
+    parser.add_argument('--out', type=str, default=ARTIFACT_PATH, help='Where to write the model artifact')
+    parser.add_argument('--episodes', type=int, default=10000, help='Number of training episodes')
+    parser.add_argument('--trainer', type=str, default='batched', choices=sorted(TRAINERS), help='Training loop to use')
+    parser.add_argument('--seed', type=int, default=None, help='RNG seed for reproducible training')
+    args = parser.parse_args()
+
+    try:
+        model = train_model(args.data, args.episodes, args.trainer, args.seed)
+        save_artifact(model, args.out)
+        return 0
+    except Exception as e:
+        logger.error(f"Error in main: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+import argparse
+import json
+import logging
+import os
+import shutil
+import sys
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_DIR = "career_snapshot"
+SNAPSHOT_VERSION = 2
+METADATA_FILE = "snapshot.json"
+
+CATEGORICAL_COLUMNS = ['current_role', 'industry', 'education_level', 'next_role']
+# Nearly unique per row, so categories would be as large as the column; stored as fixed-width text arrays
+TEXT_COLUMNS = ['user_id', 'skills', 'skills_to_learn']
+NUMERIC_DTYPES = {
+    'years_experience': np.int16,
+    'current_salary_LPA': np.float32,
+    'predicted_salary_LPA': np.float32,
+}
+# Pre-split, lowercased, for build_skill_index
+SKILL_LIST_COLUMNS = ['skills_to_learn']
+
+
+def _smallest_code_dtype(n_categories: int):
+    return np.int16 if n_categories < np.iinfo(np.int16).max else np.int32
+
+
+def split_skill_lists(values, vocab: Dict[str, int]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Split comma-separated skill strings into CSR-style ID lists
+    Args:
+        values: Iterable of skill strings, e.g. "Docker, Go, Python"
+        vocab: Skill to ID mapping, extended in place with unseen skills
+    Returns:
+        (indptr, ids) where row i's skill IDs are ids[indptr[i]:indptr[i + 1]]
+    """
+    indptr = [0]
+    ids = []
+    for value in values:
+        for skill in str(value).split(','):
+            skill = skill.strip()
+            if skill:
+                ids.append(vocab.setdefault(skill, len(vocab)))
+        indptr.append(len(ids))
+    return np.asarray(indptr, dtype=np.int32), np.asarray(ids, dtype=np.int32)
+
+
+def compile_snapshot(csv_path: str, out_dir: str = SNAPSHOT_DIR, checksum: str = None) -> Dict:
+    """
+    Compile the career dataset CSV into a directory of memory-mappable arrays
+    Low-cardinality text columns become categorical codes with their categories in
+    the metadata, free-text columns fixed-width string arrays, salaries float32, and
+    skills_to_learn also gets lowercased, pre-split ID lists with their vocabulary.
+    Args:
+        csv_path: Path to the career dataset CSV
+        out_dir: Snapshot directory, replaced if it exists
+        checksum: SHA-256 of the CSV, recorded so stale snapshots can be detected
+    Returns:
+        The snapshot metadata
+    """
+    df = pd.read_csv(csv_path)
+    df['skills'] = df['skills'].fillna('')
+    df['skills_to_learn'] = df['skills_to_learn'].fillna('')
+
+    tmp_dir = f"{out_dir}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    columns = {}
+    for col in df.columns:
+        if col in CATEGORICAL_COLUMNS:
+            categorical = pd.Categorical(df[col])
+            categories = [str(c) for c in categorical.categories]
+            codes = categorical.codes.astype(_smallest_code_dtype(len(categories)))
+            np.save(os.path.join(tmp_dir, f"{col}.npy"), codes)
+            columns[col] = {"kind": "categorical", "categories": categories}
+        elif col in TEXT_COLUMNS:
+            np.save(os.path.join(tmp_dir, f"{col}.npy"), df[col].astype(str).to_numpy(dtype=str))
+            columns[col] = {"kind": "text"}
+        else:
+            dtype = NUMERIC_DTYPES.get(col, df[col].dtype)
+            np.save(os.path.join(tmp_dir, f"{col}.npy"), df[col].to_numpy(dtype=dtype))
+            columns[col] = {"kind": "numeric"}
+
+    for col in SKILL_LIST_COLUMNS:
+        vocab = {}
+        indptr, ids = split_skill_lists((str(value).lower() for value in df[col]), vocab)
+        np.save(os.path.join(tmp_dir, f"{col}.indptr.npy"), indptr)
+        np.save(os.path.join(tmp_dir, f"{col}.ids.npy"), ids.astype(_smallest_code_dtype(len(vocab))))
+        np.save(os.path.join(tmp_dir, f"{col}.vocab.npy"), np.asarray(list(vocab), dtype=str))
+
+    metadata = {
+        "version": SNAPSHOT_VERSION,
+        "dataset_sha256": checksum,
+        "n_rows": len(df),
+        "columns": columns,
+    }
+    with open(os.path.join(tmp_dir, METADATA_FILE), 'w') as f:
+        json.dump(metadata, f)
+
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.replace(tmp_dir, out_dir)
+    logger.info(f"Compiled {csv_path} into snapshot {out_dir}")
+    return metadata
+
+
+def read_metadata(snapshot_dir: str = SNAPSHOT_DIR):
+    """Snapshot metadata, or None if there is no readable snapshot of this version"""
+    path = os.path.join(snapshot_dir, METADATA_FILE)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path) as f:
+            metadata = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read career snapshot metadata {path}: {e}")
+        return None
+    if metadata.get("version") != SNAPSHOT_VERSION:
+        return None
+    return metadata
+
+
+def load_snapshot(snapshot_dir: str = SNAPSHOT_DIR, metadata: Dict = None, mmap_mode: str = 'r') -> pd.DataFrame:
+    """
+    Load a compiled snapshot as a DataFrame backed by memory-mapped arrays
+    Args:
+        snapshot_dir: Directory written by compile_snapshot
+        metadata: Metadata already read with read_metadata, if any
+        mmap_mode: Passed to np.load; None reads the arrays into memory
+    Returns:
+        DataFrame with categorical role columns and float32 salaries. attrs["snapshot"]
+        records where it came from, so build_skill_index can use the pre-split skill lists.
+    """
+    if metadata is None:
+        metadata = read_metadata(snapshot_dir)
+        if metadata is None:
+            raise FileNotFoundError(f"No career snapshot found in {snapshot_dir}")
+
+    data = {}
+    for col, info in metadata["columns"].items():
+        values = np.load(os.path.join(snapshot_dir, f"{col}.npy"), mmap_mode=mmap_mode)
+        if info["kind"] == "categorical":
+            values = pd.Categorical.from_codes(values, categories=info["categories"])
+        data[col] = values
+    df = pd.DataFrame(data, copy=False)
+    df.attrs["snapshot"] = snapshot_dir
+    return df
+
+
+def load_skill_lists(col: str, snapshot_dir: str = SNAPSHOT_DIR, mmap_mode: str = 'r') -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Load a column's pre-split, lowercased skill ID lists from a snapshot
+    Args:
+        col: One of SKILL_LIST_COLUMNS
+    Returns:
+        (vocab, indptr, ids) where row i's skills are vocab[ids[indptr[i]:indptr[i + 1]]]
+    """
+    vocab = np.load(os.path.join(snapshot_dir, f"{col}.vocab.npy"), mmap_mode=mmap_mode)
+    indptr = np.load(os.path.join(snapshot_dir, f"{col}.indptr.npy"), mmap_mode=mmap_mode)
+    ids = np.load(os.path.join(snapshot_dir, f"{col}.ids.npy"), mmap_mode=mmap_mode)
+    return vocab, indptr, ids
+
+
+def main():
+    from career_model import DATASET_PATH, dataset_checksum
+
+    parser = argparse.ArgumentParser(description='Compile career_dataset.csv into a memory-mappable columnar snapshot')
+    parser.add_argument('--data', type=str, default=DATASET_PATH, help='Path to the career dataset CSV')
+    parser.add_argument('--out', type=str, default=SNAPSHOT_DIR, help='Snapshot directory to write')
+    args = parser.parse_args()
+
+    try:
+        compile_snapshot(args.data, args.out, dataset_checksum(args.data))
+        return 0
+    except Exception as e:
+        logger.error(f"Error in main: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,6 @@
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.preprocessing import normalize
+import numpy as np
 import pandas as pd
 import os
 from typing import List, Dict
@@ -8,31 +9,100 @@ import argparse
 import json
 import sys
 
+from culture_ann import CultureANNIndex
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class CulturalMatcher:
-    def __init__(self, data_path: str = "merged_data.csv"):
+    def __init__(self, data_path: str = "merged_data.csv", backend: str = "exact", ann_params: Dict = None,
+                 data: pd.DataFrame = None):
         """
         Initialize the cultural matcher
         Args:
             data_path: Path to the CSV file containing company culture data
+            backend: "exact" scores every company; "ann" searches a CultureANNIndex
+                and re-scores only its candidates
+            ann_params: Keyword arguments for CultureANNIndex (n_components, n_lists,
+                n_probes, rerank_factor, seed)
+            data: Company data to use instead of reading data_path
         """
         try:
-            self.data = pd.read_csv(data_path)
-            logger.info(f"Successfully loaded cultural data from {data_path}")
+            if data is None:
+                self.data = pd.read_csv(data_path)
+                logger.info(f"Successfully loaded cultural data from {data_path}")
+            else:
+                self.data = data.reset_index(drop=True)
             
             # Initialize TF-IDF vectorizer with custom stop words
             custom_stop_words = [word for word in TfidfVectorizer(stop_words='english').get_stop_words() 
                                if word not in ['no', 'not']]
             self.vectorizer = TfidfVectorizer(stop_words=custom_stop_words)
-            self.tfidf_matrix = self.vectorizer.fit_transform(self.data["Text"])
+            # Rows are L2-normalized once here, so cosine similarity is a plain dot product per query
+            self.tfidf_matrix = normalize(self.vectorizer.fit_transform(self.data["Text"]), norm='l2').tocsr()
+
+            # Result fields are pulled from these arrays instead of per-hit DataFrame row lookups
+            self.company_names = self.data["Company Name"].to_numpy(dtype=object)
+            self.descriptions = self.data["Text"].to_numpy(dtype=object)
+            self.locations = self._column_or_default("Location")
+            self.industries = self._column_or_default("Industry")
+
+            if backend not in ("exact", "ann"):
+                raise ValueError(f"Unknown cultural matcher backend: {backend}")
+            self.ann_index = None
+            if backend == "ann":
+                self.ann_index = CultureANNIndex(**(ann_params or {})).fit(self.tfidf_matrix)
             
         except Exception as e:
             logger.error(f"Failed to initialize cultural matcher: {e}")
             raise
 
+    def _column_or_default(self, column: str) -> np.ndarray:
+        if column in self.data.columns:
+            return self.data[column].to_numpy(dtype=object)
+        return np.full(len(self.data), "Not specified", dtype=object)
+
+    def score(self, user_tfidf) -> np.ndarray:
+        """
+        Cosine similarity of a transformed query against every company
+        Args:
+            user_tfidf: Query row from self.vectorizer.transform (already L2-normalized)
+        Returns:
+            Similarity score per company
+        """
+        return (self.tfidf_matrix @ user_tfidf.T).toarray().ravel()
+
+    @staticmethod
+    def top_indices(scores: np.ndarray, top_n: int) -> np.ndarray:
+        """Indices of the top_n highest scores, highest first, without sorting every score"""
+        top_n = max(0, min(int(top_n), len(scores)))
+        if top_n == 0:
+            return np.array([], dtype=np.intp)
+        top = np.argpartition(-scores, top_n - 1)[:top_n]
+        return top[np.argsort(-scores[top], kind='stable')]
+
+    def search(self, user_tfidf, top_n: int, n_probes: int = None):
+        """
+        Top companies for a transformed query
+        Uses the ANN index when one was built, falling back to exact scoring if the
+        lists it probes hold fewer than top_n candidates.
+        Args:
+            user_tfidf: Query row from self.vectorizer.transform
+            top_n: Number of results
+            n_probes: ANN lists visited, overriding the index default
+        Returns:
+            (indices, scores), highest score first
+        """
+        top_n = max(0, min(int(top_n), self.tfidf_matrix.shape[0]))
+        if self.ann_index is not None:
+            found = self.ann_index.search(self.tfidf_matrix, user_tfidf, top_n, n_probes)
+            if found is not None:
+                return found
+        similarity_scores = self.score(user_tfidf)
+        top_indices = self.top_indices(similarity_scores, top_n)
+        return top_indices, similarity_scores[top_indices]
+
     def get_company_recommendations(self, user_input: str, top_n: int = 5) -> List[Dict]:
         """
         Get company recommendations based on user input
@@ -46,22 +116,18 @@ class CulturalMatcher:
             # Transform user input
             user_tfidf = self.vectorizer.transform([user_input])
             
-            # Calculate similarity scores
-            similarity_scores = cosine_similarity(user_tfidf, self.tfidf_matrix).flatten()
-            
-            # Get top N recommendations
-            top_indices = similarity_scores.argsort()[-top_n:][::-1]
-            
+            # Get top N recommendations with their similarity scores
+            top_indices, top_scores = self.search(user_tfidf, top_n)
+
             # Prepare recommendations
             recommendations = []
-            for idx in top_indices:
-                company_data = self.data.iloc[idx]
+            for idx, score in zip(top_indices, top_scores):
                 recommendations.append({
-                    "company_name": company_data["Company Name"],
-                    "similarity_score": float(similarity_scores[idx]),
-                    "culture_description": company_data["Text"],
-                    "location": company_data.get("Location", "Not specified"),
-                    "industry": company_data.get("Industry", "Not specified")
+                    "company_name": self.company_names[idx],
+                    "similarity_score": float(score),
+                    "culture_description": self.descriptions[idx],
+                    "location": self.locations[idx],
+                    "industry": self.industries[idx]
                 })
             
             return recommendations
@@ -74,10 +140,11 @@ def main():
     parser = argparse.ArgumentParser(description='Get company cultural matches based on user preferences')
     parser.add_argument('--input', type=str, required=True, help='User preferences text')
     parser.add_argument('--top_n', type=int, default=5, help='Number of recommendations to return')
+    parser.add_argument('--backend', type=str, default='exact', choices=['exact', 'ann'], help='Search backend')
     args = parser.parse_args()
 
     try:
-        cultural_matcher = CulturalMatcher()
+        cultural_matcher = CulturalMatcher(backend=args.backend)
         recommendations = cultural_matcher.get_company_recommendations(args.input, args.top_n)
         print(json.dumps(recommendations))
         return 0
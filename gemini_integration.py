@@ -1,14 +1,122 @@
-import google.generativeai as genai
-from typing import List
+from typing import Dict, List
+import asyncio
+import json
+import logging
 import os
+import threading
+import time
+
+from advice_cache import AdviceCache, normalize_skill
+from single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+MODEL_NAME = 'gemini-2.0-flash'
+DEFAULT_MAX_CONCURRENCY = int(os.environ.get("GEMINI_MAX_CONCURRENCY", "4"))
+DEFAULT_CALL_TIMEOUT = float(os.environ.get("GEMINI_TIMEOUT", "20"))
+ADVICE_MODES = ("per_skill", "batch")
+DEFAULT_ADVICE_MODE = os.environ.get("GEMINI_ADVICE_MODE", "per_skill")
+
+SKILL_PROMPT = """
+        Provide concise information about the technical skill "{skill_name}" for someone who wants to learn it:
+        1. Brief explanation of what {skill_name} is (1-2 sentences)
+        2. Why it's important in tech/industry (1 sentence)
+        3. Resources to learn it (1-2 top resources)
+        4. Approximate time to learn basics (1 sentence)
+        
+        Keep the entire response under 150 words.
+        """
+
+BATCH_PROMPT = """
+        For each technical skill in this JSON list, give concise information for someone who wants to learn it:
+        {skills_json}
+        For every skill cover:
+        1. Brief explanation of what it is (1-2 sentences)
+        2. Why it's important in tech/industry (1 sentence)
+        3. Resources to learn it (1-2 top resources)
+        4. Approximate time to learn basics (1 sentence)
+        
+        Keep each skill's text under 150 words.
+        Reply with only a JSON object that has exactly the skill names above as keys and each skill's text as a string value.
+        """
+
+
+def parse_batch_reply(text: str, skills: List[str]) -> Dict[str, str]:
+    """
+    Split a BATCH_PROMPT reply into per-skill advice
+    Args:
+        text: Model reply, optionally wrapped in a ```json fence
+        skills: Skills that were asked about
+    Returns:
+        dict: Skill -> advice for every skill with a non-empty string answer; empty if the reply is not a JSON object
+    """
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.strip("`").strip()
+        if text.lower().startswith("json"):
+            text = text[4:]
+    try:
+        reply = json.loads(text)
+    except ValueError:
+        return {}
+    if not isinstance(reply, dict):
+        return {}
+
+    # The model may change the case or spacing of a skill name
+    answers = {normalize_skill(str(name)): advice for name, advice in reply.items()}
+    advice = {}
+    for skill in skills:
+        answer = answers.get(normalize_skill(skill))
+        if isinstance(answer, str) and answer.strip():
+            advice[skill] = answer.strip()
+    return advice
+
+# Asks Gemini for a bare JSON reply instead of Markdown-wrapped text
+JSON_REPLY = {"generation_config": {"response_mime_type": "application/json"}}
+
 
 class GeminiSkillsAdvisor:
-    def __init__(self, api_key=None):
+    def __init__(self, api_key=None, max_concurrency=DEFAULT_MAX_CONCURRENCY, call_timeout=DEFAULT_CALL_TIMEOUT,
+                 model=None, model_name=MODEL_NAME, cache=None, mode=DEFAULT_ADVICE_MODE,
+                 bundle=None):
         """
         Initialize the Gemini API client
         Args:
             api_key: The Gemini API key, if None will try to get from environment
+            max_concurrency: Gemini calls in flight at once per get_missing_skills_info_async call
+            call_timeout: Seconds before a single async Gemini call is abandoned
+            model: Object with generate_content / generate_content_async to use instead of
+                Gemini, e.g. a local fake in tests; no API key is needed then
+            model_name: Gemini model to create; also part of every cache key
+            cache (AdviceCache, optional): Reuses advice already generated for a skill
+            mode: "per_skill" sends one prompt per missing skill; "batch" asks for all of
+                them in one JSON reply and falls back to per-skill calls for skills it lacks
+            bundle (dict, optional): Pre-generated advice by normalized skill name (see
+                advice_bundle.py); the model is only created and called for skills it lacks
         """
+        if mode not in ADVICE_MODES:
+            raise ValueError(f"Unknown advice mode {mode!r}; expected one of {', '.join(ADVICE_MODES)}")
+        self.mode = mode
+        self.model_name = model_name
+        self.max_concurrency = max_concurrency
+        self.call_timeout = call_timeout
+        self.cache = cache
+        self.bundle = bundle or {}
+        self.bundle_hits = 0
+        self._api_key = api_key
+        self._model = model
+        self._model_lock = threading.Lock()
+        # With a bundle, the client is only built for the first skill the bundle lacks, so
+        # serving pre-generated advice needs neither the SDK nor an API key
+        if self._model is None and not self.bundle:
+            self._model = self._create_model()
+        # Shared by the sync and async paths, so a thread and a coroutine asking at once make one call
+        self.single_flight = SingleFlight()
+    
+    def _create_model(self):
+        import google.generativeai as genai
+
+        api_key = self._api_key
         if api_key is None:
             api_key = os.environ.get("GEMINI_API_KEY")
             if not api_key:
@@ -16,7 +124,61 @@ class GeminiSkillsAdvisor:
         
         # Configure the Gemini API
         genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel('gemini-2.0-flash')
+        return genai.GenerativeModel(self.model_name)
+    
+    @property
+    def model(self):
+        """The Gemini model, created on first use when the advisor was given a bundle"""
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    self._model = self._create_model()
+        return self._model
+    
+    def cache_key(self, skill_name: str, prompt_template: str = SKILL_PROMPT) -> str:
+        return AdviceCache.advice_key(skill_name, prompt_template, self.model_name)
+    
+    def _bundled(self, skill_name: str):
+        """Pre-generated advice for the skill, or None"""
+        advice = self.bundle.get(normalize_skill(skill_name))
+        if advice is not None:
+            self.bundle_hits += 1
+        return advice
+    
+    def _cached_batch(self, skills: List[str]) -> Dict[str, str]:
+        """Advice already in the bundle or cache, from a batched reply or an earlier per-skill fallback"""
+        found = {}
+        for skill in skills:
+            bundled = self._bundled(skill)
+            if bundled is not None:
+                found[skill] = bundled
+            elif self.cache is not None:
+                cached = self.cache.get(self.cache_key(skill, BATCH_PROMPT))
+                if cached is None:
+                    cached = self.cache.get(self.cache_key(skill))
+                if cached is not None:
+                    found[skill] = cached
+        return found
+    
+    def _store_batch(self, advice: Dict[str, str], seconds: float) -> None:
+        if self.cache is not None:
+            # One call produced every answer, so each gets an equal share of its latency
+            for skill, text in advice.items():
+                self.cache.put(self.cache_key(skill, BATCH_PROMPT), text, seconds / len(advice))
+    
+    async def _off_loop(self, fn, *args):
+        """
+        Run a cache call from the async paths
+        With an SQLite tier the call blocks on the database and on the cache's lock, so it
+        runs on a worker thread instead of stalling every request on the event loop.
+        """
+        if self.cache is not None and self.cache.db_path:
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
+    
+    @staticmethod
+    def _batch_prompt(skills: List[str]) -> str:
+        return BATCH_PROMPT.format(skills_json=json.dumps(skills))
     
     def get_skill_information(self, skill_name: str) -> str:
         """
@@ -26,20 +188,64 @@ class GeminiSkillsAdvisor:
         Returns:
             str: Detailed information about the skill
         """
-        prompt = f"""
-        Provide concise information about the technical skill "{skill_name}" for someone who wants to learn it:
-        1. Brief explanation of what {skill_name} is (1-2 sentences)
-        2. Why it's important in tech/industry (1 sentence)
-        3. Resources to learn it (1-2 top resources)
-        4. Approximate time to learn basics (1 sentence)
+        bundled = self._bundled(skill_name)
+        if bundled is not None:
+            return bundled
+        key = self.cache_key(skill_name)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
         
-        Keep the entire response under 150 words.
+        prompt = SKILL_PROMPT.format(skill_name=skill_name)
+        
+        def generate():
+            try:
+                start = time.perf_counter()
+                response = self.model.generate_content(prompt)
+                if self.cache is not None:
+                    self.cache.put(key, response.text, time.perf_counter() - start)
+                return response.text
+            except Exception as e:
+                return f"Error fetching information about {skill_name}: {str(e)}"
+        
+        return self.single_flight.do(key, generate)
+    
+    async def get_skill_information_async(self, skill_name: str) -> str:
+        """
+        get_skill_information using the SDK's async generation, bounded by call_timeout
+        Args:
+            skill_name: The name of the skill
+        Returns:
+            str: Detailed information about the skill, or an error message for this skill alone
         """
+        bundled = self._bundled(skill_name)
+        if bundled is not None:
+            return bundled
+        key = self.cache_key(skill_name)
+        if self.cache is not None:
+            cached = await self._off_loop(self.cache.get, key)
+            if cached is not None:
+                return cached
+        
+        prompt = SKILL_PROMPT.format(skill_name=skill_name)
+        
+        async def generate():
+            try:
+                start = time.perf_counter()
+                response = await asyncio.wait_for(self.model.generate_content_async(prompt), timeout=self.call_timeout)
+                if self.cache is not None:
+                    await self._off_loop(self.cache.put, key, response.text, time.perf_counter() - start)
+                return response.text
+            except asyncio.TimeoutError:
+                return f"Error fetching information about {skill_name}: timed out after {self.call_timeout:g}s"
+            except Exception as e:
+                return f"Error fetching information about {skill_name}: {str(e)}"
         
         try:
-            response = self.model.generate_content(prompt)
-            return response.text
+            return await self.single_flight.do_async(key, generate)
         except Exception as e:
+            # e.g. the shared call was cancelled at shutdown; one skill's failure must not fail the gather
             return f"Error fetching information about {skill_name}: {str(e)}"
     
     def get_missing_skills_info(self, missing_skills: List[str]) -> dict:
@@ -50,12 +256,122 @@ class GeminiSkillsAdvisor:
         Returns:
             dict: Dictionary mapping each skill to its information
         """
+        if self.mode == "batch":
+            return self.get_missing_skills_info_batch(missing_skills)
+        
         skills_info = {}
         
         for skill in missing_skills:
             skills_info[skill] = self.get_skill_information(skill)
             
         return skills_info
+    
+    def get_missing_skills_info_batch(self, missing_skills: List[str]) -> dict:
+        """
+        Get information about multiple missing skills with one structured request
+        Skills the reply leaves out, or every skill if the reply is not valid JSON
+        or the call fails, are fetched one by one with get_skill_information.
+        Args:
+            missing_skills: List of skills to get information about
+        Returns:
+            dict: Dictionary mapping each skill to its information, in input order
+        """
+        skills = list(dict.fromkeys(missing_skills))
+        skills_info = self._cached_batch(skills)
+        pending = [skill for skill in skills if skill not in skills_info]
+        
+        if pending:
+            try:
+                start = time.perf_counter()
+                prompt = self._batch_prompt(pending)
+                reply = self.single_flight.do(
+                    (self.model_name, prompt), lambda: self.model.generate_content(prompt, **JSON_REPLY).text
+                )
+                advice = parse_batch_reply(reply, pending)
+                self._store_batch(advice, time.perf_counter() - start)
+                skills_info.update(advice)
+            except Exception as e:
+                logger.warning(f"Batched skill advice failed, falling back to per-skill calls: {e}")
+            
+            fallback = [skill for skill in pending if skill not in skills_info]
+            if fallback:
+                logger.info(f"Batched reply missing {len(fallback)} of {len(pending)} skills, fetching them one by one")
+            for skill in fallback:
+                skills_info[skill] = self.get_skill_information(skill)
+        
+        return {skill: skills_info[skill] for skill in skills}
+    
+    async def get_missing_skills_info_async(self, missing_skills: List[str]) -> dict:
+        """
+        Get information about multiple missing skills concurrently
+        At most max_concurrency calls run at once, so total latency is close to the
+        slowest call rather than the sum. A failed or timed-out skill gets an error
+        message without affecting the others.
+        Args:
+            missing_skills: List of skills to get information about
+        Returns:
+            dict: Dictionary mapping each skill to its information, in input order
+        """
+        if self.mode == "batch":
+            return await self.get_missing_skills_info_batch_async(missing_skills)
+        
+        skills = list(dict.fromkeys(missing_skills))
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+        
+        async def bounded(skill):
+            async with semaphore:
+                return await self.get_skill_information_async(skill)
+        
+        results = await asyncio.gather(*(bounded(skill) for skill in skills))
+        return dict(zip(skills, results))
+    
+    async def get_missing_skills_info_batch_async(self, missing_skills: List[str]) -> dict:
+        """
+        get_missing_skills_info_batch using the SDK's async generation
+        The batched call is bounded by call_timeout; the per-skill fallback runs
+        concurrently, as in per-skill mode.
+        Args:
+            missing_skills: List of skills to get information about
+        Returns:
+            dict: Dictionary mapping each skill to its information, in input order
+        """
+        skills = list(dict.fromkeys(missing_skills))
+        skills_info = await self._off_loop(self._cached_batch, skills)
+        pending = [skill for skill in skills if skill not in skills_info]
+        
+        if pending:
+            try:
+                start = time.perf_counter()
+                prompt = self._batch_prompt(pending)
+                
+                async def generate():
+                    response = await asyncio.wait_for(
+                        self.model.generate_content_async(prompt, **JSON_REPLY), timeout=self.call_timeout
+                    )
+                    return response.text
+                
+                reply = await self.single_flight.do_async((self.model_name, prompt), generate)
+                advice = parse_batch_reply(reply, pending)
+                await self._off_loop(self._store_batch, advice, time.perf_counter() - start)
+                skills_info.update(advice)
+            except asyncio.TimeoutError:
+                logger.warning(f"Batched skill advice timed out after {self.call_timeout:g}s, falling back to per-skill calls")
+            except Exception as e:
+                logger.warning(f"Batched skill advice failed, falling back to per-skill calls: {e}")
+            
+            fallback = [skill for skill in pending if skill not in skills_info]
+            if fallback:
+                logger.info(f"Batched reply missing {len(fallback)} of {len(pending)} skills, fetching them one by one")
+                semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+                
+                async def bounded(skill):
+                    async with semaphore:
+                        return await self.get_skill_information_async(skill)
+                
+                results = await asyncio.gather(*(bounded(skill) for skill in fallback))
+                skills_info.update(zip(fallback, results))
+        
+        return {skill: skills_info[skill] for skill in skills}
 
 
 # Add this function to your ResumeParser class
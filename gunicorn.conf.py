@@ -0,0 +1,18 @@
+# Multi-worker deployment: gunicorn -c gunicorn.conf.py main:app
+#
+# With preload_app the career artifact and data, the transition and skill indexes, the
+# resume skill matcher and the cultural-match TF-IDF matrix are built once in the master
+# and shared copy-on-write by the forked workers instead of being loaded by each of them.
+import multiprocessing
+import os
+
+preload_app = os.environ.get("NEXTLEAP_PRELOAD", "1") == "1"
+os.environ["NEXTLEAP_PRELOAD"] = "1" if preload_app else "0"
+
+bind = os.environ.get("BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+# Every worker runs its own resume parse pool; share the host's CPUs between them
+# rather than starting up to 4 parse processes per worker.
+os.environ.setdefault("RESUME_PARSE_WORKERS", str(max(1, min(4, multiprocessing.cpu_count() // workers))))
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = 120
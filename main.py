@@ -1,17 +1,19 @@
 from dotenv import load_dotenv
 load_dotenv()
+import gc
+import os
+from concurrent.futures.process import BrokenProcessPool
 from fastapi import FastAPI, HTTPException, Request
-import pandas as pd
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
 import numpy as np
-import random
-import gym
-from gym import spaces
-from sklearn.preprocessing import LabelEncoder
 import logging
 from fastapi.middleware.cors import CORSMiddleware
-from resume_parser import ResumeParser
-from gemini_integration import GeminiSkillsAdvisor
-from culturematch import CulturalMatcher
+from subsystems import Subsystem, SubsystemUnavailable, READY
+from career_model import (
+    DATASET_PATH, ARTIFACT_PATH, load_career_data, load_or_train, prepare_career_data,
+    build_transition_index, build_skill_index, skill_match_counts, rank_transitions, top_k_indices,
+)
 
 app = FastAPI()
 
@@ -27,139 +29,159 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Load and prepare career dataset
-career_df = pd.read_csv("career_dataset.csv")
-career_df['skills'] = career_df['skills'].fillna('')
-career_df['skills_to_learn'] = career_df['skills_to_learn'].fillna('')
-
-domain_mapping = {
-    "Software Engineer": "Software Development",
-    "Full Stack Developer": "Software Development",
-    "Front-End Developer (React, Angular, etc.)": "Software Development",
-    "Back-End Developer (Node.js, Django, Spring Boot, etc.)": "Software Development",
-    "Mobile App Developer (Android/iOS)": "Software Development",
-    "DevOps Engineer": "Software Development",
-    "Site Reliability Engineer (SRE)": "Software Development",
-    "Embedded Software Engineer": "Software Development",
-    "Game Developer": "Software Development",
-    "API Developer": "Software Development",
-    "Software Architect": "Software Development",
-    "Cloud Developer (AWS/GCP/Azure)": "Software Development",
-    "Data Scientist": "Data Science & Analytics",
-    "Data Analyst": "Data Science & Analytics",
-    "Business Intelligence Analyst": "Data Science & Analytics",
-    "Machine Learning Engineer": "Data Science & Analytics",
-    "Data Engineer": "Data Science & Analytics",
-    "Big Data Engineer": "Data Science & Analytics",
-    "Decision Scientist": "Data Science & Analytics",
-    "AI/ML Research Scientist": "Data Science & Analytics",
-    "NLP Engineer": "Data Science & Analytics",
-    "Deep Learning Engineer": "Data Science & Analytics",
-    "Computer Vision Engineer": "Data Science & Analytics",
-    "MLOps Engineer": "Data Science & Analytics",
-    "Cybersecurity Analyst": "Cybersecurity",
-    "Security Engineer": "Cybersecurity",
-    "Ethical Hacker": "Cybersecurity",
-    "Security Architect": "Cybersecurity",
-    "Network Security Engineer": "Cybersecurity",
-    "SOC Analyst": "Cybersecurity",
-    "Information Security Analyst": "Cybersecurity",
-    "Cryptographer": "Cybersecurity",
-    "Cloud Solutions Architect": "Cloud & Infrastructure",
-    "Cloud Engineer": "Cloud & Infrastructure",
-    "System Administrator": "Cloud & Infrastructure",
-    "Network Engineer": "Cloud & Infrastructure",
-    "IT Infrastructure Engineer": "Cloud & Infrastructure",
-    "Database Administrator (DBA)": "Cloud & Infrastructure",
-    "Virtualization Engineer": "Cloud & Infrastructure",
-    "Storage Engineer": "Cloud & Infrastructure",
-    "Technical Support Engineer": "IT Support & Systems",
-    "IT Support Specialist": "IT Support & Systems",
-    "Help Desk Technician": "IT Support & Systems",
-    "System Support Engineer": "IT Support & Systems",
-    "Desktop Support Engineer": "IT Support & Systems",
-    "QA Engineer": "Testing & Quality Assurance",
-    "Automation Test Engineer": "Testing & Quality Assurance",
-    "Manual Test Engineer": "Testing & Quality Assurance",
-    "Performance Tester": "Testing & Quality Assurance",
-    "SDET": "Testing & Quality Assurance",
-    "Test Architect": "Testing & Quality Assurance",
-    "UI Developer": "UI/UX and Web Technology",
-    "UX Designer": "UI/UX and Web Technology",
-    "AI Research Scientist": "AI Research & Emerging Tech",
-    "Robotics Engineer": "AI Research & Emerging Tech",
-    "Quantum Computing Researcher": "AI Research & Emerging Tech",
-    "Blockchain Developer": "AI Research & Emerging Tech",
-    "AR/VR Developer": "AI Research & Emerging Tech",
-    "Computer Vision Researcher": "AI Research & Emerging Tech",
-    "Technical Program Manager (TPM)": "Technical Management & Consulting",
-    "Engineering Manager": "Technical Management & Consulting",
-    "Product Manager (Technical)": "Technical Management & Consulting"
-}
-
-career_df['domain'] = career_df['next_role'].map(domain_mapping)
-
-encoders = {}
-for col in ['current_role', 'next_role', 'education_level']:
-    le = LabelEncoder()
-    career_df[col] = le.fit_transform(career_df[col])
-    encoders[col] = le
-
-role_name_map = {name.lower(): name for name in encoders['current_role'].classes_}
-edu_name_map = {name.lower(): name for name in encoders['education_level'].classes_}
-
-# Define environment
-class CareerEnv(gym.Env):
-    def __init__(self, data):
-        super().__init__()
-        self.data = data
-        self.max_steps = len(data) - 1
-        self.observation_space = spaces.Box(low=0, high=100, shape=(4,), dtype=np.float32)
-        self.action_space = spaces.Discrete(data['next_role'].nunique())
-
-    def reset(self):
-        self.current_step = random.randint(0, self.max_steps)
-        row = self.data.iloc[self.current_step]
-        return np.array([row['current_role'], row['years_experience'], row['education_level'], row['current_salary_LPA']], dtype=np.float32)
-
-    def step(self, action):
-        row = self.data.iloc[self.current_step]
-        reward = 0
-        done = True
-        if action == row['next_role']:
-            increase = row['predicted_salary_LPA'] - row['current_salary_LPA']
-            reward = increase if increase > 0 else 0
-        next_state = self.reset()
-        return next_state, reward, done, {}
-
-env = CareerEnv(career_df)
-q_table = np.zeros((career_df['current_role'].nunique(), env.action_space.n))
-alpha, gamma, epsilon = 0.1, 0.6, 0.1
-
-for _ in range(10000):
-    state = env.reset()
-    current_role = int(state[0])
-    action = env.action_space.sample() if random.uniform(0, 1) < epsilon else np.argmax(q_table[current_role])
-    next_state, reward, _, _ = env.step(action)
-    next_role = int(next_state[0])
-    q_table[current_role, action] = (1 - alpha) * q_table[current_role, action] + alpha * (reward + gamma * np.max(q_table[next_role]))
-
-# Resume and Culture systems
-resume_parser = ResumeParser()
-gemini_advisor = GeminiSkillsAdvisor()
-cultural_matcher = CulturalMatcher()
+def _load_career_model():
+    """Career dataset, trained transition model and the indexes the career endpoints serve from"""
+    career_df = load_career_data(DATASET_PATH)
+    model = load_or_train(DATASET_PATH, ARTIFACT_PATH)
+    encoders = model["encoders"]
+    q_table = model["q_table"]
+
+    prepare_career_data(career_df, encoders, model["domain_mapping"])
+    return {
+        "domain_mapping": model["domain_mapping"],
+        "role_name_map": model["role_name_map"],
+        "role_codes": {name: code for code, name in enumerate(encoders['current_role'].classes_)},
+        "q_table": q_table,
+        "transition_index": build_transition_index(career_df, encoders, q_table.shape[1]),
+        "skill_index": build_skill_index(career_df, encoders),
+    }
+
+# Career, Resume and Culture systems, built in the background after startup or on first use
+# Resume text and skill extraction run in a process pool; 0 parses on the threadpool instead
+# (gunicorn.conf.py divides the host's CPUs between its workers' pools)
+RESUME_PARSE_WORKERS = int(os.environ.get("RESUME_PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+def _load_resume_parser():
+    from resume_parser import ResumeParser
+    from resume_cache import ResumeCache
+    cache = ResumeCache(max_entries=int(os.environ.get("RESUME_CACHE_SIZE", "1024")),
+                        db_path=os.environ.get("RESUME_CACHE_DB") or None,
+                        ttl=float(os.environ.get("RESUME_CACHE_TTL", str(24 * 3600))),
+                        max_disk_entries=int(os.environ.get("RESUME_CACHE_DB_SIZE", "10000")))
+    # With a pool, this instance only serves the cache and skill matching, so it needs no spaCy model
+    return ResumeParser(nlp_mode="none" if RESUME_PARSE_WORKERS else None, cache=cache)
+
+def _load_resume_pool():
+    from parse_pool import ResumeParsePool
+    # Skill extraction only reads the text, so pool processes never load a spaCy model whatever RESUME_NLP_MODE says
+    pool = ResumeParsePool(
+        n_workers=RESUME_PARSE_WORKERS,
+        max_queue=int(os.environ.get("RESUME_PARSE_QUEUE", str(2 * RESUME_PARSE_WORKERS))),
+        timeout=float(os.environ.get("RESUME_PARSE_TIMEOUT", "30")),
+        parser_kwargs={"nlp_mode": "none"},
+    )
+    pool.warm_up()
+    return pool
+
+def _load_gemini_advisor():
+    from gemini_integration import GeminiSkillsAdvisor
+    from advice_cache import AdviceCache
+    cache = AdviceCache(max_entries=int(os.environ.get("GEMINI_CACHE_SIZE", "4096")),
+                        db_path=os.environ.get("GEMINI_CACHE_DB") or None,
+                        ttl=float(os.environ.get("GEMINI_CACHE_TTL", str(7 * 24 * 3600))))
+    bundle = None
+    if os.environ.get("GEMINI_ADVICE_BUNDLE"):
+        from advice_bundle import load_bundle
+        bundle = load_bundle(os.environ["GEMINI_ADVICE_BUNDLE"])
+        logger.info(f"Loaded pre-generated advice for {len(bundle)} skills")
+    return GeminiSkillsAdvisor(cache=cache, bundle=bundle)
+
+def _load_cultural_matcher():
+    from culturematch import CulturalMatcher
+    ann_params = {}
+    for param, var, cast in (("n_probes", "CULTURE_ANN_PROBES", int), ("n_lists", "CULTURE_ANN_LISTS", int),
+                             ("rerank_factor", "CULTURE_ANN_RERANK", int)):
+        if os.environ.get(var):
+            ann_params[param] = cast(os.environ[var])
+    return CulturalMatcher(backend=os.environ.get("CULTURE_MATCH_BACKEND", "exact"), ann_params=ann_params)
+
+# Nothing is loaded at import outside preloading: when this module is run as a script, every
+# spawned pool process re-imports it as __mp_main__ and must not repeat the loads
+career_model = Subsystem("career_model", _load_career_model)
+resume_parser = Subsystem("resume_parser", _load_resume_parser)
+gemini_advisor = Subsystem("gemini_advisor", _load_gemini_advisor)
+cultural_matcher = Subsystem("cultural_matcher", _load_cultural_matcher)
+subsystems = [career_model, resume_parser, gemini_advisor, cultural_matcher]
+# Not preloaded: pool processes belong to the process that starts them, so each server worker runs its own
+resume_pool = Subsystem("resume_pool", _load_resume_pool)
+if RESUME_PARSE_WORKERS:
+    subsystems.append(resume_pool)
+
+# Under a preloading server (see gunicorn.conf.py) the read-only models are built once in the
+# master and inherited by every forked worker. The Gemini client is left to each worker because
+# its gRPC channel does not survive fork. gc.freeze() keeps the collector from writing to the
+# inherited objects, which would otherwise copy their pages into every worker.
+PRELOAD_SUBSYSTEMS = os.environ.get("NEXTLEAP_PRELOAD", "0") == "1" and __name__ != "__mp_main__"
+if PRELOAD_SUBSYSTEMS:
+    for subsystem in (career_model, resume_parser, cultural_matcher):
+        try:
+            subsystem.get()
+        except SubsystemUnavailable:
+            pass
+    gc.freeze()
+
+@app.on_event("startup")
+def start_subsystems():
+    for subsystem in subsystems:
+        subsystem.start()
+
+@app.on_event("shutdown")
+def stop_resume_pool():
+    from pdf_text import shutdown_page_pool
+    if resume_pool.state == READY:
+        resume_pool.get().shutdown()
+    # Started by in-process parses of long PDFs when RESUME_PARSE_WORKERS=0
+    shutdown_page_pool()
+
+def get_career_model() -> dict:
+    """The career model for the synchronous endpoints, which run on the threadpool; init failures map to 503"""
+    try:
+        return career_model.get()
+    except SubsystemUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+async def get_subsystem(subsystem: Subsystem):
+    """Wait for a subsystem off the event loop, mapping init failures to 503"""
+    try:
+        return await run_in_threadpool(subsystem.get)
+    except SubsystemUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
 
 @app.get("/health")
 def health():
     return {"status": "running"}
 
-@app.post("/api/career-recommendations")
-def get_career_recommendations(request: dict):
-    user_role = request.get("current_role", "").strip().lower()
-
-    if user_role == 'fresher':
-        return {"message": "Use /api/fresher-recommendations for fresher queries"}
-
+@app.get("/ready")
+def ready():
+    status = {subsystem.name: subsystem.status() for subsystem in subsystems}
+    all_ready = all(subsystem.state == READY for subsystem in subsystems)
+    return JSONResponse(
+        status_code=200 if all_ready else 503,
+        content={"ready": all_ready, "subsystems": status}
+    )
+
+@app.get("/cache-stats")
+def cache_stats():
+    """Hit/miss counters of the caches of loaded subsystems"""
+    stats = {}
+    if resume_parser.state == READY and resume_parser.get().cache is not None:
+        stats["resume_parser"] = resume_parser.get().cache.stats()
+    if resume_pool.state == READY:
+        # "rejected" and "timed_out" count the parses answered with 429 and 504
+        stats["resume_pool"] = resume_pool.get().stats()
+    if gemini_advisor.state == READY and gemini_advisor.get().cache is not None:
+        stats["gemini_advisor"] = gemini_advisor.get().cache.stats()
+    if gemini_advisor.state == READY:
+        # "coalesced" counts model calls saved by joining an identical call already in flight
+        stats["gemini_single_flight"] = gemini_advisor.get().single_flight.stats()
+    if gemini_advisor.state == READY and gemini_advisor.get().bundle:
+        stats["gemini_advice_bundle"] = {"entries": len(gemini_advisor.get().bundle),
+                                         "hits": gemini_advisor.get().bundle_hits}
+    return stats
+
+def resolve_role(user_role: str) -> str:
+    """Map a lowercase role name (or a fragment of one) to its dataset spelling"""
+    role_name_map = get_career_model()["role_name_map"]
     actual_role = role_name_map.get(user_role)
     if actual_role is None:
         for role in role_name_map:
@@ -168,40 +190,103 @@ def get_career_recommendations(request: dict):
                 break
         if actual_role is None:
             raise HTTPException(status_code=400, detail="Role not recognized.")
+    return actual_role
+
+def parse_career_profile(request: dict, resolved_roles: dict = None):
+    """
+    Validate one career profile
+    Args:
+        request: Profile with current_role, years_experience, education and current_salary
+        resolved_roles: Optional cache of resolve_role results shared across a batch
+    Returns:
+        (actual_role, user_salary)
+    """
+    user_role = request.get("current_role", "").strip().lower()
+    if resolved_roles is None:
+        actual_role = resolve_role(user_role)
+    else:
+        if user_role not in resolved_roles:
+            try:
+                resolved_roles[user_role] = resolve_role(user_role)
+            except HTTPException as e:
+                resolved_roles[user_role] = e
+        actual_role = resolved_roles[user_role]
+        if isinstance(actual_role, HTTPException):
+            raise actual_role
 
-    encoded_role = encoders['current_role'].transform([actual_role])[0]
-    domain_of_user = domain_mapping.get(actual_role, None)
-    user_experience = float(request.get("years_experience", 0))
-    user_education_input = request.get("education", "Bachelors").strip().lower()
     user_salary = float(request.get("current_salary", 0))
-    user_education = edu_name_map.get(user_education_input, 'Bachelors')
-    encoded_edu = encoders['education_level'].transform([user_education])[0]
-
-    q_values = q_table[encoded_role]
-    valid_actions = []
-    for idx, q in enumerate(q_values):
-        match = career_df[(career_df['next_role'] == idx) & (career_df['domain'] == domain_of_user)]
-        if not match.empty:
-            sample = match.iloc[0]
-            if sample['predicted_salary_LPA'] > user_salary and idx != encoded_role:
-                valid_actions.append((idx, q))
-
-    if not valid_actions:
-        return [{"message": "No suitable career transitions found."}]
-
-    top_roles = sorted(valid_actions, key=lambda x: x[1], reverse=True)[:2]
-    recommendations = []
-    for action_idx, _ in top_roles:
-        info = career_df[career_df['next_role'] == action_idx].iloc[0]
-        role = encoders['next_role'].inverse_transform([action_idx])[0]
-        recommendations.append({
-            "next_role": role,
-            "skills_to_learn": info['skills_to_learn'],
-            "predicted_salary": info['predicted_salary_LPA'],
-            "salary_increase": info['predicted_salary_LPA'] - user_salary
-        })
-
-    return recommendations
+    return actual_role, user_salary
+
+def recommend_transitions(profiles: list, k: int = 2) -> list:
+    """
+    Rank next roles for already-parsed profiles as one batch
+    Args:
+        profiles: (actual_role, user_salary) tuples from parse_career_profile
+        k: Number of recommendations per profile
+    Returns:
+        One recommendation list per profile, in input order
+    """
+    career = get_career_model()
+    transition_index = career["transition_index"]
+    encoded_roles = [career["role_codes"][role] for role, _ in profiles]
+    domains = [career["domain_mapping"].get(role, None) for role, _ in profiles]
+    user_salaries = np.array([salary for _, salary in profiles], dtype=float)
+    actions, valid = rank_transitions(transition_index, career["q_table"], encoded_roles, domains, user_salaries, k)
+
+    salaries = transition_index["salary"]
+    results = []
+    for row_actions, row_valid, user_salary in zip(actions, valid, user_salaries):
+        recommendations = [{
+            "next_role": transition_index["role_names"][action_idx],
+            "skills_to_learn": transition_index["skills_to_learn"][action_idx],
+            "predicted_salary": float(salaries[action_idx]),
+            "salary_increase": float(salaries[action_idx]) - float(user_salary)
+        } for action_idx in row_actions[row_valid]]
+        results.append(recommendations or [{"message": "No suitable career transitions found."}])
+    return results
+
+@app.post("/api/career-recommendations")
+def get_career_recommendations(request: dict):
+    user_role = request.get("current_role", "").strip().lower()
+
+    if user_role == 'fresher':
+        return {"message": "Use /api/fresher-recommendations for fresher queries"}
+
+    return recommend_transitions([parse_career_profile(request)])[0]
+
+@app.post("/api/career-recommendations/batch")
+def get_career_recommendations_batch(request: dict):
+    """
+    Career recommendations for many profiles in one call
+    Body: {"profiles": [{current_role, years_experience, education, current_salary}, ...]}
+    Returns {"results": [...]} in input order; each item has "recommendations"
+    (as returned by /api/career-recommendations) or an "error" for that profile.
+    """
+    profiles = request.get("profiles")
+    if not isinstance(profiles, list):
+        raise HTTPException(status_code=400, detail="profiles must be a list")
+
+    results = [None] * len(profiles)
+    parsed, positions = [], []
+    resolved_roles = {}
+    for i, profile in enumerate(profiles):
+        try:
+            if not isinstance(profile, dict):
+                raise ValueError("profile must be an object")
+            if profile.get("current_role", "").strip().lower() == 'fresher':
+                raise ValueError("Use /api/fresher-recommendations for fresher queries")
+            parsed.append(parse_career_profile(profile, resolved_roles))
+            positions.append(i)
+        except HTTPException as e:
+            results[i] = {"index": i, "error": e.detail}
+        except (AttributeError, TypeError, ValueError) as e:
+            results[i] = {"index": i, "error": str(e)}
+
+    if parsed:
+        for i, recommendations in zip(positions, recommend_transitions(parsed)):
+            results[i] = {"index": i, "recommendations": recommendations}
+
+    return {"results": results}
 
 @app.post("/api/fresher-recommendations")
 def get_fresher_recommendations(request: dict):
@@ -209,14 +294,19 @@ def get_fresher_recommendations(request: dict):
     if not skills:
         raise HTTPException(status_code=400, detail="Skills are required")
 
-    career_df['skill_match'] = career_df['skills_to_learn'].apply(lambda x: sum(skill in str(x).lower() for skill in skills))
-    recs = career_df[career_df['skill_match'] > 0].drop_duplicates('next_role').sort_values(by='skill_match', ascending=False).head(2)
+    skill_index = get_career_model()["skill_index"]
+    counts = skill_match_counts(skill_index, skills)
+    matched_rows = np.flatnonzero((counts > 0) & skill_index["known_role"])
+
+    # One row per next_role: the first matching row in dataset order
+    _, first = np.unique(skill_index["next_role"][matched_rows], return_index=True)
+    candidates = np.sort(matched_rows[first])
 
     return [{
-        "next_role": encoders['next_role'].inverse_transform([int(row['next_role'])])[0],
-        "skills_to_learn": row['skills_to_learn'],
-        "predicted_salary": row['predicted_salary_LPA']
-    } for _, row in recs.iterrows()]
+        "next_role": skill_index["role_names"][skill_index["next_role"][row]],
+        "skills_to_learn": skill_index["skills_to_learn"][row],
+        "predicted_salary": float(skill_index["salary"][row])
+    } for row in top_k_indices(counts, candidates, 2)]
 
 @app.post("/api/cultural-match")
 async def cultural_match(request: Request):
@@ -228,47 +318,122 @@ async def cultural_match(request: Request):
         if not preferences:
             raise HTTPException(status_code=400, detail="Preferences are required")
 
-        recommendations = cultural_matcher.get_company_recommendations(preferences, top_n)
+        matcher = await get_subsystem(cultural_matcher)
+        recommendations = matcher.get_company_recommendations(preferences, top_n)
         return {"recommendations": recommendations}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Cultural matching failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 from fastapi import UploadFile, File, Form
-import shutil
 
 @app.post("/api/analyze-skills")
 async def analyze_skills(
     resume: UploadFile = File(...),
     target_role: str = Form(None),
-    gemini_advice: bool = Form(False)
+    gemini_advice: bool = Form(False),
+    best_fit_roles: bool = Form(False),
+    top_k: int = Form(5)
 ):
     """
     Analyze uploaded resume and return categorized skills (and skill match if target_role provided).
     If gemini_advice is true and there are missing skills, return Gemini-powered advice for missing skills.
+    If best_fit_roles is true, also rank every role by match percentage, with matched and missing skills for the top_k.
     """
-    import os
-    import tempfile
     try:
-        suffix = os.path.splitext(resume.filename)[1]
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-            shutil.copyfileobj(resume.file, tmp)
-            tmp_path = tmp.name
-        # Parse resume
-        result = resume_parser.parse_resume(tmp_path, target_role)
-        os.remove(tmp_path)
+        # Parse the upload from memory; nothing is written to disk
+        parser = await get_subsystem(resume_parser)
+        data = await resume.read()
+        if RESUME_PARSE_WORKERS:
+            result = await parse_in_pool(parser, data, resume.filename, target_role)
+        else:
+            result = await run_in_threadpool(parser.parse_resume, data, target_role, resume.filename)
         if not result:
             raise HTTPException(status_code=500, detail="Failed to extract skills")
+        if best_fit_roles:
+            result["best_fit_roles"] = parser.rank_roles(result["categorized_skills"], top_k)
 
         # If Gemini advice is requested and missing skills exist
         if gemini_advice and result.get("skill_match") and result["skill_match"].get("missing_skills"):
             missing_skills = result["skill_match"]["missing_skills"]
-            gemini_info = resume_parser.get_missing_skills_advice(missing_skills, gemini_advisor)
+            advisor = await get_subsystem(gemini_advisor)
+            gemini_info = await parser.get_missing_skills_advice_async(missing_skills, advisor)
             result["gemini_advice"] = gemini_info
         return result
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
+def valid_skill_input(skills) -> bool:
+    """A list of skill names or a categorized_skills object"""
+    if isinstance(skills, dict):
+        return all(isinstance(names, list) and all(isinstance(n, str) for n in names) for names in skills.values())
+    return isinstance(skills, list) and all(isinstance(n, str) for n in skills)
+
+@app.post("/api/skill-match/batch")
+async def skill_match_batch(request: dict):
+    """
+    Match percentages for many (skills, role) pairs in one call, e.g. a set of parsed resumes against shortlisted roles
+    Body: {"pairs": [{"skills": categorized_skills dict or list of skill names, "role": job role}, ...]}
+    Returns {"results": [...]} in input order; each item has "match_percentage" or an "error" for that pair.
+    """
+    pairs = request.get("pairs")
+    if not isinstance(pairs, list):
+        raise HTTPException(status_code=400, detail="pairs must be a list")
+    parser = await get_subsystem(resume_parser)
+
+    results = [None] * len(pairs)
+    skills, roles, positions = [], [], []
+    for i, pair in enumerate(pairs):
+        if not isinstance(pair, dict):
+            results[i] = {"index": i, "error": "pair must be an object"}
+        elif not isinstance(pair.get("role"), str) or pair["role"] not in parser.job_roles_skills:
+            results[i] = {"index": i, "error": f"Unknown role: {pair.get('role')}"}
+        elif not valid_skill_input(pair.get("skills")):
+            results[i] = {"index": i, "error": "skills must be a list of names or an object of category -> list of names"}
+        else:
+            skills.append(pair["skills"])
+            roles.append(pair["role"])
+            positions.append(i)
+
+    if positions:
+        percentages = await run_in_threadpool(parser.score_role_pairs, skills, roles)
+        for i, role, percentage in zip(positions, roles, percentages):
+            results[i] = {"index": i, "role": role, "match_percentage": percentage}
+
+    return {"results": results}
+
+async def parse_in_pool(parser, data: bytes, filename: str, target_role: str):
+    """
+    parse_resume with text and skill extraction in the process pool
+    Cache hits and the role-specific skill match are handled here without a pool round trip.
+    """
+    from parse_pool import PoolSaturated, ParseTimeout
+
+    def lookup():
+        key = parser.cache_key(data)
+        return key, parser.cache.get(key) if parser.cache is not None else None
+
+    # Hashing the upload and the SQLite tier both block, so neither runs on the event loop
+    key, entry = await run_in_threadpool(lookup)
+    if entry is None:
+        pool = await get_subsystem(resume_pool)
+        try:
+            entry = await pool.extract_resume(data, filename)
+        except PoolSaturated as e:
+            raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
+        except ParseTimeout as e:
+            raise HTTPException(status_code=504, detail=str(e))
+        except BrokenProcessPool as e:
+            raise HTTPException(status_code=503, detail=f"Resume parser unavailable: {e}")
+        if entry is None:
+            return None
+        await run_in_threadpool(parser.store_entry, key, entry)
+    return parser.result_from_entry(entry, target_role)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
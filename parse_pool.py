@@ -0,0 +1,115 @@
+import asyncio
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# ResumeParser held by each pool process
+_worker_parser = None
+
+
+def _init_worker(parser_kwargs: Dict) -> None:
+    global _worker_parser
+    from pdf_text import PdfTextExtractor
+    from resume_parser import ResumeParser
+    # The pool already runs one parse per process, so long PDFs are not split across more processes
+    _worker_parser = ResumeParser(**{"pdf_extractor": PdfTextExtractor(page_workers=1), **parser_kwargs})
+
+
+def _extract_resume(data: bytes, filename: Optional[str]) -> Optional[Dict]:
+    return _worker_parser.extract_resume(data, filename)
+
+
+def _ping() -> bool:
+    return _worker_parser is not None
+
+
+class PoolSaturated(RuntimeError):
+    """Raised when every worker is busy and the admission queue is full"""
+
+
+class ParseTimeout(RuntimeError):
+    """Raised when a parse does not finish within the pool's timeout"""
+
+
+class ResumeParsePool:
+    def __init__(self, n_workers: int, max_queue: int, timeout: float, parser_kwargs: Optional[Dict] = None):
+        """
+        Process pool for the CPU-bound part of resume parsing, so it never runs on the event loop
+        Each process builds its own ResumeParser once. At most n_workers + max_queue
+        parses are admitted at a time; beyond that, submit raises PoolSaturated.
+        Args:
+            n_workers: Pool processes
+            max_queue: Parses allowed to wait for a free process
+            timeout: Seconds a caller waits for a result before ParseTimeout
+            parser_kwargs: Keyword arguments for each process's ResumeParser
+        """
+        self.n_workers = n_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        # Workers are spawned rather than forked: the server process runs threads,
+        # and forking a threaded process can copy a lock in its held state.
+        self._executor = ProcessPoolExecutor(
+            max_workers=n_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(parser_kwargs or {},),
+        )
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    def warm_up(self) -> None:
+        """Start every process and wait until each has loaded its parser"""
+        futures = [self._executor.submit(_ping) for _ in range(self.n_workers)]
+        for future in futures:
+            future.result()
+        logger.info(f"Resume parse pool ready with {self.n_workers} processes")
+
+    def _release(self, _future) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    async def extract_resume(self, data: bytes, filename: Optional[str] = None) -> Optional[Dict]:
+        """
+        Run ResumeParser.extract_resume in a pool process
+        Raises:
+            PoolSaturated: If the admission queue is full
+            ParseTimeout: If the result takes longer than the timeout. The slot stays taken
+                until the process actually finishes, so a stuck parse still counts against the bound.
+        """
+        with self._lock:
+            if self.in_flight >= self.n_workers + self.max_queue:
+                self.rejected += 1
+                raise PoolSaturated(f"Resume parser busy: {self.in_flight} parses in progress")
+            self.in_flight += 1
+        try:
+            future = self._executor.submit(_extract_resume, data, filename)
+        except Exception:
+            with self._lock:
+                self.in_flight -= 1
+            raise
+        future.add_done_callback(self._release)
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self.timed_out += 1
+            raise ParseTimeout(f"Resume parsing took longer than {self.timeout:g}s")
+
+    def stats(self) -> Dict:
+        return {
+            "workers": self.n_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
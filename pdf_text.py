@@ -0,0 +1,245 @@
+import io
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_PAGES = int(os.environ.get("PDF_MAX_PAGES", "50"))
+DEFAULT_TIME_BUDGET = float(os.environ.get("PDF_TIME_BUDGET", "10"))
+# Documents with at least this many pages are split across page_workers processes
+DEFAULT_PARALLEL_PAGES = int(os.environ.get("PDF_PARALLEL_PAGES", "24"))
+
+
+class PyMuPDFBackend:
+    name = "pymupdf"
+
+    def __init__(self):
+        import fitz
+        self._fitz = fitz
+
+    def open(self, data: bytes):
+        return self._fitz.open(stream=data, filetype="pdf")
+
+    def page_count(self, document) -> int:
+        return document.page_count
+
+    def page_text(self, document, index: int) -> str:
+        return document.load_page(index).get_text()
+
+
+class PdfiumBackend:
+    name = "pypdfium2"
+
+    def __init__(self):
+        import pypdfium2
+        self._pdfium = pypdfium2
+
+    def open(self, data: bytes):
+        return self._pdfium.PdfDocument(data)
+
+    def page_count(self, document) -> int:
+        return len(document)
+
+    def page_text(self, document, index: int) -> str:
+        return document[index].get_textpage().get_text_range()
+
+
+class PyPDFBackend:
+    name = "pypdf"
+
+    def __init__(self):
+        from pypdf import PdfReader
+        self._reader = PdfReader
+
+    def open(self, data: bytes):
+        return self._reader(io.BytesIO(data))
+
+    def page_count(self, document) -> int:
+        return len(document.pages)
+
+    def page_text(self, document, index: int) -> str:
+        return document.pages[index].extract_text() or ""
+
+
+class PyPDF2Backend(PyPDFBackend):
+    name = "PyPDF2"
+
+    def __init__(self):
+        from PyPDF2 import PdfReader
+        self._reader = PdfReader
+
+
+# Fastest first; PyPDF2 is the only one in the base requirements
+BACKENDS = [PyMuPDFBackend, PdfiumBackend, PyPDFBackend, PyPDF2Backend]
+
+
+def available_backends() -> List[str]:
+    """Names of the backends whose library is installed, fastest first"""
+    names = []
+    for backend in BACKENDS:
+        try:
+            backend()
+            names.append(backend.name)
+        except ImportError:
+            continue
+    return names
+
+
+def load_backend(name: Optional[str] = None):
+    """
+    Instantiate a PDF backend
+    Args:
+        name: Backend name; None picks the fastest installed one
+    """
+    for backend in BACKENDS:
+        if name is not None and backend.name != name:
+            continue
+        try:
+            return backend()
+        except ImportError:
+            if name is not None:
+                raise
+    raise ValueError(f"No PDF backend available (requested {name!r}); known: {', '.join(b.name for b in BACKENDS)}")
+
+
+# Page-splitting processes, shared by every PdfTextExtractor in this process
+_page_pool = None
+_page_pool_pid = None
+_page_pool_lock = threading.Lock()
+
+
+def page_pool(n_workers: int) -> ProcessPoolExecutor:
+    """
+    The process's shared page pool, started on first use with n_workers processes
+    Workers are spawned, not forked: the caller may be a threaded server process,
+    and forking a threaded process can copy a lock in its held state.
+    """
+    global _page_pool, _page_pool_pid
+    with _page_pool_lock:
+        # A pool inherited through fork belongs to the parent
+        if _page_pool is None or _page_pool_pid != os.getpid():
+            _page_pool = ProcessPoolExecutor(max_workers=n_workers, mp_context=multiprocessing.get_context("spawn"))
+            _page_pool_pid = os.getpid()
+        return _page_pool
+
+
+def shutdown_page_pool() -> None:
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is not None and _page_pool_pid == os.getpid():
+            _page_pool.shutdown(wait=False, cancel_futures=True)
+        _page_pool = None
+
+
+def _extract_pages(backend_name: str, data: bytes, start: int, stop: int, deadline: float) -> List[str]:
+    """
+    Process pool body: text of pages [start, stop), stopping early once the wall clock passes deadline
+    deadline is a time.time() value because monotonic clocks are not comparable across processes.
+    """
+    backend = load_backend(backend_name)
+    document = backend.open(data)
+    pages = []
+    for index in range(start, stop):
+        if time.time() > deadline:
+            break
+        pages.append(backend.page_text(document, index))
+    return pages
+
+
+class PdfTextExtractor:
+    def __init__(self, backend: Optional[str] = None, max_pages: int = DEFAULT_MAX_PAGES,
+                 time_budget: float = DEFAULT_TIME_BUDGET, parallel_pages: int = DEFAULT_PARALLEL_PAGES,
+                 page_workers: Optional[int] = None):
+        """
+        Bounded PDF text extraction with a pluggable backend
+        Args:
+            backend: Backend name (see BACKENDS); defaults to $PDF_BACKEND, else the fastest installed
+            max_pages: Pages read at most; later pages are skipped and the result marked partial
+            time_budget: Wall-clock seconds per document; 0 disables the limit
+            parallel_pages: Page count from which pages are split across processes
+            page_workers: Processes for long documents; 1 keeps everything in this process and
+                should be used wherever the extractor already runs inside a worker pool
+        """
+        self.backend = load_backend(backend or os.environ.get("PDF_BACKEND") or None)
+        self.max_pages = max_pages
+        self.time_budget = time_budget
+        self.parallel_pages = parallel_pages
+        self.page_workers = page_workers or min(4, os.cpu_count() or 1)
+
+    @staticmethod
+    def read_bytes(source) -> bytes:
+        """PDF contents from a path, bytes or binary file-like object"""
+        if isinstance(source, str):
+            with open(source, 'rb') as f:
+                return f.read()
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return bytes(source)
+        return source.read()
+
+    def extract(self, source) -> Dict:
+        """
+        Extract text from a PDF
+        Args:
+            source: Path, bytes or binary file-like object
+        Returns:
+            dict: text, page_count, pages_read, partial (True when the page cap or the
+            time budget stopped extraction early) and the backend used
+        """
+        start = time.monotonic()
+        data = self.read_bytes(source)
+        document = self.backend.open(data)
+        page_count = self.backend.page_count(document)
+        n_pages = min(page_count, self.max_pages) if self.max_pages else page_count
+        budget = self.time_budget if self.time_budget and self.time_budget > 0 else None
+
+        if self.page_workers > 1 and n_pages >= self.parallel_pages:
+            remaining = None if budget is None else max(budget - (time.monotonic() - start), 0)
+            pages = self._extract_parallel(data, n_pages, remaining)
+        else:
+            pages = []
+            for index in range(n_pages):
+                # The first page is always read so an over-budget document still yields some text
+                if pages and budget is not None and time.monotonic() - start > budget:
+                    break
+                pages.append(self.backend.page_text(document, index))
+
+        partial = len(pages) < page_count
+        if partial:
+            logger.warning(f"PDF extraction stopped after {len(pages)} of {page_count} pages "
+                           f"({time.monotonic() - start:.1f}s)")
+        return {
+            "text": "\n".join(pages),
+            "page_count": page_count,
+            "pages_read": len(pages),
+            "partial": partial,
+            "backend": self.backend.name,
+        }
+
+    def _extract_parallel(self, data: bytes, n_pages: int, budget: Optional[float]) -> List[str]:
+        """
+        Split the pages into one contiguous range per worker
+        Pages are only kept up to the first range that did not finish, so the text is
+        always a prefix of the document.
+        """
+        pool = page_pool(self.page_workers)
+        deadline = float("inf") if budget is None else time.time() + budget
+        bounds = [n_pages * i // self.page_workers for i in range(self.page_workers + 1)]
+        ranges = [(lo, hi) for lo, hi in zip(bounds, bounds[1:]) if hi > lo]
+        futures = [pool.submit(_extract_pages, self.backend.name, data, lo, hi, deadline) for lo, hi in ranges]
+        done, _ = wait(futures, timeout=budget)
+
+        pages = []
+        for future, (lo, hi) in zip(futures, ranges):
+            if future not in done:
+                future.cancel()
+                break
+            chunk = future.result()
+            pages.extend(chunk)
+            if len(chunk) < hi - lo:
+                break
+        return pages
@@ -0,0 +1,133 @@
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+from resume_parser import ResumeParser, NLP_MODES, DEFAULT_NLP_MODE
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+RESUME_EXTENSIONS = ('.pdf', '.docx')
+
+
+def find_resumes(inputs):
+    """
+    Resume files under the given files and directories, searched recursively
+    Args:
+        inputs (list): File and directory paths
+    Returns:
+        list: Absolute paths of PDF/DOCX files, sorted within each directory
+    """
+    found = []
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, dirs, files in os.walk(item):
+                dirs.sort()
+                found.extend(os.path.abspath(os.path.join(root, name)) for name in sorted(files)
+                             if name.lower().endswith(RESUME_EXTENSIONS))
+        elif item.lower().endswith(RESUME_EXTENSIONS):
+            found.append(os.path.abspath(item))
+        else:
+            logger.warning(f"Skipping {item}: not a PDF/DOCX file or a directory")
+    return found
+
+
+def completed_paths(out_path):
+    """
+    Paths already recorded in a JSON Lines output file
+    A run killed mid-write can leave a partial last line; it is truncated so the
+    file stays valid JSON Lines when appended to, and that resume is parsed again.
+    """
+    done = set()
+    if not os.path.exists(out_path):
+        return done
+
+    with open(out_path, 'rb+') as f:
+        data = f.read()
+        complete = data[:data.rfind(b'\n') + 1]
+        if len(complete) < len(data):
+            f.truncate(len(complete))
+            logger.warning(f"Dropped a partial last line from {out_path}")
+    for line in complete.splitlines():
+        try:
+            done.add(json.loads(line)["path"])
+        except (ValueError, KeyError):
+            continue
+    return done
+
+
+def run(paths, out_path, parser, n_workers=None, batch_size=64, target_job=None, report_every=10.0):
+    """
+    Parse resumes into a JSON Lines file, skipping any already in it
+    Args:
+        paths (list): Resume file paths
+        out_path (str): Output file; appended to, one JSON object per resume
+        parser (ResumeParser): Parser to use
+        n_workers (int, optional): Text extraction processes
+        batch_size (int): Texts per nlp.pipe batch
+        target_job (str, optional): Role to compute skill_match against
+        report_every (float): Seconds between progress log lines
+    Returns:
+        dict: Counts of parsed, failed and skipped resumes, elapsed seconds and resumes per second
+    """
+    done = completed_paths(out_path)
+    todo = [path for path in paths if path not in done]
+    skipped = len(paths) - len(todo)
+    if skipped:
+        logger.info(f"Resuming: {skipped} of {len(paths)} resumes already in {out_path}")
+
+    parsed = failed = 0
+    start = last_report = time.perf_counter()
+    with open(out_path, 'a') as out:
+        for result in parser.parse_resumes(todo, n_workers=n_workers, batch_size=batch_size, target_job=target_job):
+            out.write(json.dumps(result) + '\n')
+            out.flush()
+            if "error" in result:
+                failed += 1
+            else:
+                parsed += 1
+
+            now = time.perf_counter()
+            if now - last_report >= report_every:
+                finished = parsed + failed
+                logger.info(f"{finished}/{len(todo)} resumes, {finished / (now - start):.1f}/s")
+                last_report = now
+
+    elapsed = time.perf_counter() - start
+    stats = {
+        "parsed": parsed,
+        "failed": failed,
+        "skipped": skipped,
+        "seconds": elapsed,
+        "resumes_per_second": (parsed + failed) / elapsed if elapsed > 0 else 0.0,
+    }
+    logger.info(f"Parsed {parsed}, failed {failed}, skipped {skipped} in {elapsed:.1f}s "
+                f"({stats['resumes_per_second']:.1f} resumes/s)")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Parse directories of resumes into a JSON Lines file')
+    parser.add_argument('inputs', type=str, nargs='+', help='Resume files or directories to search for PDF/DOCX files')
+    parser.add_argument('--out', type=str, default='resumes.jsonl', help='JSON Lines output; an existing file is resumed')
+    parser.add_argument('--workers', type=int, default=None, help='Text extraction processes (default: CPU count)')
+    parser.add_argument('--batch_size', type=int, default=64, help='Texts per nlp.pipe batch')
+    parser.add_argument('--target_job', type=str, default=None, help='Role to compute skill match against')
+    parser.add_argument('--nlp_mode', type=str, default=DEFAULT_NLP_MODE, choices=NLP_MODES, help='spaCy pipeline mode')
+    args = parser.parse_args()
+
+    try:
+        paths = find_resumes(args.inputs)
+        run(paths, args.out, ResumeParser(nlp_mode=args.nlp_mode), n_workers=args.workers,
+            batch_size=args.batch_size, target_job=args.target_job)
+        return 0
+    except Exception as e:
+        logger.error(f"Error in main: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,23 @@
+from typing import Dict, Optional
+
+from tiered_cache import TieredCache
+
+
+class ResumeCache(TieredCache):
+    def __init__(self, max_entries: int = 1024, db_path: Optional[str] = None, ttl: float = 24 * 3600,
+                 max_disk_entries: int = 10000):
+        """
+        Two-tier cache of resume parses keyed by content hash and taxonomy version
+        Entries hold categorized_skills and extraction info, i.e. everything the response
+        needs that does not depend on the target role, so one upload serves any number
+        of skill_match requests. The resume text itself is never stored.
+        Args:
+            max_entries: Size of the in-memory LRU tier
+            db_path: SQLite file for the on-disk tier; None keeps the cache in memory only
+            ttl: Seconds an entry stays valid; 0 or None never expires
+            max_disk_entries: Rows kept in the SQLite tier
+        """
+        super().__init__("resume_cache", max_entries, db_path, ttl, max_disk_entries)
+
+    def put(self, key: str, categorized_skills: Dict, info: Optional[Dict] = None) -> None:
+        super().put(key, {"categorized_skills": categorized_skills, "info": info or {}})
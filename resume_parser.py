@@ -1,15 +1,76 @@
-import re
+import hashlib
+import io
 import os
 import json
-from PyPDF2 import PdfReader
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 import docx2txt
-import spacy
+
+from pdf_text import PdfTextExtractor
+from role_match import RoleMatcher
+from skill_matcher import SkillMatcher
+
+SPACY_MODEL = 'en_core_web_lg'
+NLP_MODES = ("none", "tokenizer", "full")
+DEFAULT_NLP_MODE = os.environ.get("RESUME_NLP_MODE", "none")
+DEFAULT_NLP_EXCLUDE = [name for name in os.environ.get("RESUME_NLP_EXCLUDE", "").split(",") if name]
+
+
+def load_nlp(mode=DEFAULT_NLP_MODE, model=SPACY_MODEL, exclude=()):
+    """
+    Load the spaCy pipeline for a parsing mode
+    Skill extraction only reads the document text, so "none" gives identical results
+    without importing spaCy; the other modes are for callers that need tokens or annotations.
+    Args:
+        mode (str): "none" (no spaCy), "tokenizer" (blank English tokenizer, no model)
+            or "full" (the trained model)
+        model (str): spaCy model loaded in "full" mode
+        exclude (list): Pipeline components not to load in "full" mode, e.g. ["parser", "ner"]
+    Returns:
+        The spaCy Language object, or None in "none" mode
+    """
+    if mode not in NLP_MODES:
+        raise ValueError(f"Unknown NLP mode {mode!r}; expected one of {', '.join(NLP_MODES)}")
+    if mode == "none":
+        return None
+
+    import spacy
+    if mode == "tokenizer":
+        return spacy.blank("en")
+    return spacy.load(model, exclude=list(exclude))
+
+
+# Per-process parser used by parse_resumes workers for text extraction only
+_text_worker = None
+
+
+def _init_text_worker():
+    global _text_worker
+    # Batch workers are already one process per core, so long PDFs are not split further
+    _text_worker = ResumeParser(nlp_mode="none", pdf_extractor=PdfTextExtractor(page_workers=1))
+
+
+def _extract_text_worker(path):
+    """Returns (path, text, extraction info, error) so one unreadable file does not stop a batch"""
+    try:
+        return (path, *_text_worker.extract_text_with_info(path), None)
+    except Exception as e:
+        return path, "", {}, str(e)
 
 
 class ResumeParser:
-    def __init__(self):
-        # Load the spaCy model for NER and text processing
-        self.nlp = spacy.load('en_core_web_lg')
+    def __init__(self, nlp_mode=None, spacy_model=SPACY_MODEL, exclude=None, pdf_extractor=None, cache=None):
+        """
+        Args:
+            nlp_mode (str, optional): See load_nlp; defaults to $RESUME_NLP_MODE or "none"
+            spacy_model (str): spaCy model used in "full" mode
+            exclude (list, optional): Components skipped in "full" mode; defaults to $RESUME_NLP_EXCLUDE
+            pdf_extractor (PdfTextExtractor, optional): PDF backend and limits; defaults come from $PDF_* variables
+            cache (ResumeCache, optional): Reuses the skills of previously parsed files with the same content
+        """
+        self.pdf_extractor = pdf_extractor or PdfTextExtractor()
+        self.cache = cache
+        self.nlp_mode = nlp_mode or DEFAULT_NLP_MODE
+        self.nlp = load_nlp(self.nlp_mode, spacy_model, DEFAULT_NLP_EXCLUDE if exclude is None else exclude)
         
         # Define common section headers in resumes
         self.section_headers = {
@@ -393,63 +454,166 @@ class ResumeParser:
         self.all_skills = set()
         for category in self.technical_skills.values():
             self.all_skills.update([skill.lower() for skill in category])
+
+        self.build_skill_matcher()
+
+    def build_skill_matcher(self, aliases=None):
+        """
+        Compile technical_skills into one automaton so extract_skills scans each resume once
+        Call again after changing technical_skills.
+        Args:
+            aliases (dict, optional): Extra spellings mapped to a taxonomy skill, e.g. {"k8s": "kubernetes"}
+        """
+        self.skill_matcher = SkillMatcher()
+        for category_index, skill_list in enumerate(self.technical_skills.values()):
+            for skill_index, skill in enumerate(skill_list):
+                self.skill_matcher.add(skill, (category_index, skill_index))
+
+        if aliases:
+            for alias, skill in aliases.items():
+                for category_index, skill_list in enumerate(self.technical_skills.values()):
+                    for skill_index, known in enumerate(skill_list):
+                        if known.lower() == skill.lower():
+                            self.skill_matcher.add(alias, (category_index, skill_index))
+        self.skill_matcher.build()
+
+        # Part of every cache key, so cached skills are never served for a different taxonomy
+        taxonomy = json.dumps([self.technical_skills, aliases or {}], sort_keys=True)
+        self.taxonomy_version = hashlib.sha256(taxonomy.encode()).hexdigest()[:16]
+
+        taxonomy_skills = [skill for skill_list in self.technical_skills.values() for skill in skill_list]
+        self.role_matcher = RoleMatcher(self.job_roles_skills, taxonomy_skills)
     
-    def extract_text_from_pdf(self, pdf_path):
-        text = ""
+    @staticmethod
+    def _as_stream(source):
+        """Wrap raw bytes in a stream; file-like objects are used as they are"""
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return io.BytesIO(source)
+        return source
+
+    @staticmethod
+    def detect_format(stream, filename=None):
+        """
+        Resume format from the file name when there is one (a path or an upload's original name),
+        otherwise from the leading bytes (PDF files start with %PDF, DOCX files are zip archives)
+        Returns:
+            str: "pdf", "docx", or None if unsupported
+        """
+        if filename:
+            extension = os.path.splitext(filename)[1].lower()
+            return {'.pdf': 'pdf', '.docx': 'docx'}.get(extension)
+
+        position = stream.tell()
+        header = stream.read(4)
+        stream.seek(position)
+        if header.startswith(b'%PDF'):
+            return 'pdf'
+        if header.startswith(b'PK'):
+            return 'docx'
+        return None
+
+    def extract_pdf(self, pdf_path):
+        """
+        Extract PDF text within the extractor's page cap and time budget
+        Args:
+            pdf_path: Path to the PDF, its bytes, or a binary file-like object
+        Returns:
+            dict: See PdfTextExtractor.extract; text is empty if the PDF could not be read
+        """
         try:
-            pdf_path = pdf_path.strip('"').strip("'")  # Handle both single and double quotes
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = PdfReader(file)
-                for page in pdf_reader.pages:
-                    text += page.extract_text()
+            if isinstance(pdf_path, str):
+                pdf_path = pdf_path.strip('"').strip("'")  # Handle both single and double quotes
+            return self.pdf_extractor.extract(self._as_stream(pdf_path))
         except Exception as e:
             print(f"Error reading PDF: {str(e)}")
-        return text
+            return {"text": "", "page_count": 0, "pages_read": 0, "partial": False}
+
+    def extract_text_from_pdf(self, pdf_path):
+        """
+        Args:
+            pdf_path: Path to the PDF, its bytes, or a binary file-like object
+        """
+        return self.extract_pdf(pdf_path)["text"]
 
     def extract_text_from_docx(self, docx_path):
+        """
+        Args:
+            docx_path: Path to the DOCX, its bytes, or a binary file-like object
+        """
         try:
-            docx_path = docx_path.strip('"').strip("'")  # Handle both single and double quotes
-            text = docx2txt.process(docx_path)
+            if isinstance(docx_path, str):
+                docx_path = docx_path.strip('"').strip("'")  # Handle both single and double quotes
+            text = docx2txt.process(self._as_stream(docx_path))
             return text
         except Exception as e:
             print(f"Error reading DOCX: {str(e)}")
             return ""
 
-    def extract_text(self, file_path):
-        file_path = file_path.strip('"').strip("'")  # Handle both single and double quotes
-        
-        if not os.path.exists(file_path):
-            print(f"Error: File not found at path: {file_path}")
-            return ""
-            
-        if file_path.lower().endswith('.pdf'):
-            return self.extract_text_from_pdf(file_path)
-        elif file_path.lower().endswith('.docx'):
-            return self.extract_text_from_docx(file_path)
+    def extract_text(self, file_path, filename=None):
+        """
+        Extract text from a PDF or DOCX resume
+        Args:
+            file_path: Path to the resume, or its contents as bytes or a binary file-like
+                object (e.g. an upload's spooled file), so uploads never have to be written to disk
+            filename (str, optional): Original file name of in-memory contents, used to pick the format
+        """
+        return self.extract_text_with_info(file_path, filename)[0]
+
+    def extract_text_with_info(self, file_path, filename=None):
+        """
+        Like extract_text, but also reports whether a PDF was cut short
+        Returns:
+            tuple: (text, info) where info is empty for a complete extraction, and
+            {"partial": True, "page_count": ..., "pages_read": ...} when the PDF page cap
+            or time budget stopped it early
+        """
+        if not isinstance(file_path, str):
+            stream = self._as_stream(file_path)
+            resume_format = self.detect_format(stream, filename)
+        else:
+            file_path = file_path.strip('"').strip("'")  # Handle both single and double quotes
+            if not os.path.exists(file_path):
+                print(f"Error: File not found at path: {file_path}")
+                return "", {}
+            stream = file_path
+            resume_format = self.detect_format(None, file_path)
+
+        if resume_format == 'pdf':
+            extracted = self.extract_pdf(stream)
+            info = {}
+            if extracted["partial"]:
+                info = {"partial": True, "page_count": extracted["page_count"], "pages_read": extracted["pages_read"]}
+            return extracted["text"], info
+        elif resume_format == 'docx':
+            return self.extract_text_from_docx(stream), {}
         else:
             print("Unsupported file format. Please provide a PDF or DOCX file.")
-            return ""
+            return "", {}
+
+    def process_text(self, text):
+        """Run the configured pipeline over text; returns the text itself in "none" mode"""
+        if self.nlp is None:
+            return text
+        return self.nlp(text)
 
     def extract_skills(self, doc):
         """
         Extract skills from the document text and categorize them according to technical_skills
         Args:
-            doc: The processed document text
+            doc: The processed spaCy document, or the plain text when no pipeline is loaded
         Returns:
             dict: Categorized skills found in the resume
         """
         categorized_skills = {category: [] for category in self.technical_skills.keys()}
         
         # Convert doc text to lowercase for better matching
-        text_lower = doc.text.lower()
+        text_lower = (doc if isinstance(doc, str) else doc.text).lower()
         
-        # Extract skills from all categories
-        for category, skill_list in self.technical_skills.items():
-            for skill in skill_list:
-                # Check for exact word boundaries
-                pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-                if re.search(pattern, text_lower):
-                    categorized_skills[category].append(skill)
+        # Find skills from all categories in a single pass, then report them in taxonomy order
+        categories = list(self.technical_skills.items())
+        for category_index, skill_index in sorted(self.skill_matcher.find(text_lower)):
+            category, skill_list = categories[category_index]
+            categorized_skills[category].append(skill_list[skill_index])
         
         # Remove empty categories
         categorized_skills = {k: v for k, v in categorized_skills.items() if v}
@@ -457,32 +621,34 @@ class ResumeParser:
         return categorized_skills
 
     def analyze_skill_match(self, candidate_skills, required_skills):
-        """Analyze how well the candidate's skills match the required skills"""
-        # Flatten the categorized skills into a single list
-        all_candidate_skills = []
-        for skills in candidate_skills.values():
-            all_candidate_skills.extend(skills)
-        
-        candidate_skills_lower = {skill.lower() for skill in all_candidate_skills}
-        required_skills_lower = {skill.lower() for skill in required_skills}
-        
-        matched_skills = []
-        missing_skills = []
-        
-        for req_skill in required_skills:
-            if any(candidate.lower() in req_skill.lower() or req_skill.lower() in candidate.lower() 
-                  for candidate in all_candidate_skills):
-                matched_skills.append(req_skill)
-            else:
-                missing_skills.append(req_skill)
-        
-        match_percentage = (len(matched_skills) / len(required_skills)) * 100 if required_skills else 0
-        
-        return {
-            'match_percentage': match_percentage,
-            'matched_skills': matched_skills,
-            'missing_skills': missing_skills
-        }
+        """
+        Analyze how well the candidate's skills match the required skills
+        A requirement is matched when a candidate skill contains it or is contained in it;
+        requirements are resolved to taxonomy skill IDs once, so this is set intersection.
+        """
+        return self.role_matcher.match(candidate_skills, required_skills)
+
+    def score_role_pairs(self, candidate_skills, roles):
+        """
+        Match percentage for many (candidate skills, role) pairs in one sparse product
+        Args:
+            candidate_skills (list): Categorized skills dict or skill list per pair
+            roles (list): Role name per pair, from job_roles_skills
+        Returns:
+            list: Match percentage per pair, as analyze_skill_match would report it
+        """
+        return self.role_matcher.score_pairs(candidate_skills, roles).tolist()
+
+    def rank_roles(self, candidate_skills, top_k=5):
+        """
+        Analyze the skill match against every role in job_roles_skills at once
+        Args:
+            candidate_skills (dict): Categorized skills, as returned by extract_skills
+            top_k (int): Number of best-fitting roles to include matched and missing skills for
+        Returns:
+            list: Every role with its match_percentage, best first
+        """
+        return self.role_matcher.rank_roles(candidate_skills, top_k)
 
     def check_missing_skills(self, extracted_skills, role_skills):
         """
@@ -493,14 +659,8 @@ class ResumeParser:
         Returns:
             list: List of missing skills
         """
-        # Convert all skills to lowercase for case-insensitive comparison
-        extracted_lower = [skill.lower() for skill in extracted_skills]
-        missing_skills = []
-        
-        for skill in role_skills:
-            skill_lower = skill.lower()
-            if not any(skill_lower in extracted.lower() for extracted in extracted_lower):
-                missing_skills.append(skill)
+        # A role skill is missing unless an extracted skill contains it (case-insensitive)
+        missing_skills = self.role_matcher.missing(list(extracted_skills), role_skills)
         
         # Only print missing skills once if they exist
         if missing_skills:
@@ -526,19 +686,90 @@ class ResumeParser:
             role_skills = self.job_roles_skills["MLOps Engineer"]
             return self.check_missing_skills(extracted_skills, role_skills)
 
-    def parse_resume(self, file_path, target_job=None):
-        """Parse the resume and extract relevant information"""
-        # Extract text from the resume
-        text = self.extract_text(file_path)
+    def parse_resume(self, file_path, target_job=None, filename=None):
+        """
+        Parse the resume and extract relevant information
+        With a cache, a file whose contents were parsed before skips text extraction and
+        skill extraction; only the skill match for target_job is recomputed.
+        Args:
+            file_path: Resume path, bytes or binary file-like object (see extract_text)
+            target_job (str, optional): Role to analyze the skill match against
+            filename (str, optional): Original file name of in-memory contents
+        """
+        if self.cache is None:
+            # Extract text from the resume
+            text, extraction_info = self.extract_text_with_info(file_path, filename)
+            if not text:
+                return None
+
+            # Process the text with spaCy, if a pipeline is configured
+            doc = self.process_text(text)
+            result = self.analyze_doc(doc, target_job)
+            result.update(extraction_info)
+            return result
+
+        data, filename = self._read_source(file_path, filename)
+        if not data:
+            return None
+        key = self.cache_key(data)
+        entry = self.cache.get(key)
+        if entry is None:
+            entry = self.extract_resume(data, filename)
+            if entry is None:
+                return None
+            self.store_entry(key, entry)
+        return self.result_from_entry(entry, target_job)
+
+    def cache_key(self, data):
+        """Cache key for resume contents: SHA-256 of the bytes plus the taxonomy version"""
+        return f"{hashlib.sha256(data).hexdigest()}:{self.taxonomy_version}"
+
+    def extract_resume(self, data, filename=None):
+        """
+        Role-independent part of parse_resume, the part worth caching or running in another process
+        Returns:
+            dict: {"categorized_skills", "info"}, or None if no text could be extracted
+        """
+        text, extraction_info = self.extract_text_with_info(data, filename)
         if not text:
             return None
+        categorized_skills = self.extract_skills(self.process_text(text))
+        return {"categorized_skills": categorized_skills, "info": extraction_info}
+
+    def store_entry(self, key, entry):
+        """Add an extract_resume entry to the cache, if there is one"""
+        # A partial extraction depends on the page cap and time budget, not just the file
+        if self.cache is not None and not entry["info"].get("partial"):
+            self.cache.put(key, entry["categorized_skills"], entry["info"])
 
-        # Process the text with spaCy
-        doc = self.nlp(text)
+    def result_from_entry(self, entry, target_job=None):
+        """parse_resume result for an extract_resume entry"""
+        categorized_skills = {category: list(skills) for category, skills in entry["categorized_skills"].items()}
+        result = self.build_result(categorized_skills, target_job)
+        result.update(entry["info"])
+        return result
+
+    def _read_source(self, file_path, filename=None):
+        """Contents of a resume path, bytes or file-like object, plus the name used to detect its format"""
+        if isinstance(file_path, str):
+            file_path = file_path.strip('"').strip("'")  # Handle both single and double quotes
+            if not os.path.exists(file_path):
+                print(f"Error: File not found at path: {file_path}")
+                return b"", filename
+            with open(file_path, 'rb') as f:
+                return f.read(), filename or file_path
+        if isinstance(file_path, (bytes, bytearray, memoryview)):
+            return bytes(file_path), filename
+        return file_path.read(), filename
 
+    def analyze_doc(self, doc, target_job=None):
+        """Build the parse_resume result for an already processed document"""
         # Extract information
         categorized_skills = self.extract_skills(doc)
+        return self.build_result(categorized_skills, target_job)
 
+    def build_result(self, categorized_skills, target_job=None):
+        """parse_resume result for extracted skills; only skill_match depends on target_job"""
         # Prepare the result
         result = {
             "categorized_skills": categorized_skills,
@@ -553,6 +784,62 @@ class ResumeParser:
 
         return result
 
+    def parse_resumes(self, paths, n_workers=None, batch_size=64, target_job=None):
+        """
+        Parse many resumes, yielding each result as soon as its batch is processed
+        Text is extracted from the PDF/DOCX files in a process pool; the extracted texts
+        go through the NLP pipeline in batches with nlp.pipe. Results are not in input order.
+        Args:
+            paths (iterable): Resume file paths; consumed lazily
+            n_workers (int, optional): Extraction processes, defaults to the CPU count; 0 extracts in this process
+            batch_size (int): Texts per nlp.pipe batch
+            target_job (str, optional): Role to compute skill_match against
+        Yields:
+            dict: {"path": ..., **parse_resume result}, or {"path": ..., "error": ...}
+        """
+        batch = []
+        for path, text, info, error in self._extract_texts(paths, n_workers):
+            if error or not text:
+                yield {"path": path, "error": error or "No text extracted"}
+                continue
+            batch.append((path, text, info))
+            if len(batch) >= batch_size:
+                yield from self._parse_batch(batch, batch_size, target_job)
+                batch = []
+        yield from self._parse_batch(batch, batch_size, target_job)
+
+    @staticmethod
+    def _extract_texts(paths, n_workers):
+        """(path, text, extraction info, error) for each path, in completion order"""
+        paths = iter(paths)
+        if n_workers == 0:
+            _init_text_worker()
+            yield from (_extract_text_worker(path) for path in paths)
+            return
+
+        n_workers = n_workers or os.cpu_count() or 1
+        # Keep every worker busy without reading the whole path list up front
+        max_pending = 4 * n_workers
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_text_worker) as executor:
+            pending = set()
+            while True:
+                while len(pending) < max_pending:
+                    path = next(paths, None)
+                    if path is None:
+                        break
+                    pending.add(executor.submit(_extract_text_worker, path))
+                if not pending:
+                    return
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+    def _parse_batch(self, batch, batch_size, target_job):
+        texts = [text for _, text, _ in batch]
+        docs = self.nlp.pipe(texts, batch_size=batch_size) if self.nlp is not None else texts
+        for (path, _, info), doc in zip(batch, docs):
+            yield {"path": path, **self.analyze_doc(doc, target_job), **info}
+
     def get_missing_skills_advice(self, missing_skills, gemini_advisor):
         """
         Get advice about missing skills from Gemini
@@ -567,6 +854,20 @@ class ResumeParser:
         
         return gemini_advisor.get_missing_skills_info(missing_skills)
 
+    async def get_missing_skills_advice_async(self, missing_skills, gemini_advisor):
+        """
+        Like get_missing_skills_advice, but fetches advice for all skills concurrently
+        Args:
+            missing_skills (list): List of missing skills
+            gemini_advisor: Initialized GeminiSkillsAdvisor object
+        Returns:
+            dict: Dictionary with information about each missing skill
+        """
+        if not missing_skills:
+            return {}
+        
+        return await gemini_advisor.get_missing_skills_info_async(missing_skills)
+
 def main():
     parser = ResumeParser()
     
@@ -0,0 +1,179 @@
+from scipy import sparse
+import numpy as np
+from typing import Dict, Iterable, List, Union
+
+SkillInput = Union[Dict[str, List[str]], Iterable[str]]
+
+
+def flatten_skills(candidate_skills: SkillInput) -> List[str]:
+    """Skill names from a categorized_skills dict or a plain list"""
+    if isinstance(candidate_skills, dict):
+        return [skill for skills in candidate_skills.values() for skill in skills]
+    return list(candidate_skills)
+
+
+def satisfies(skill: str, requirement: str) -> bool:
+    """The analyze_skill_match rule: either lowercased name contains the other"""
+    skill, requirement = skill.lower(), requirement.lower()
+    return skill in requirement or requirement in skill
+
+
+class RoleMatcher:
+    def __init__(self, job_roles_skills: Dict[str, List[str]], skills: Iterable[str]):
+        """
+        Role x requirement view of job_roles_skills for scoring a resume against every role at once
+        Every requirement of every role is a row of requirement_matrix, marking the taxonomy
+        skills that satisfy it under the analyze_skill_match rule; role_matrix groups
+        those rows by role. Percentages therefore equal analyze_skill_match for each role.
+        Args:
+            job_roles_skills: Role name -> required skills
+            skills: Taxonomy skill names that extract_skills can return
+        """
+        self.roles = list(job_roles_skills)
+        self.skills = list(dict.fromkeys(skill.lower() for skill in skills))
+        self.skill_ids = {skill: i for i, skill in enumerate(self.skills)}
+
+        self.requirements = [req for role in self.roles for req in job_roles_skills[role]]
+        self.role_sizes = np.array([len(job_roles_skills[role]) for role in self.roles])
+        self.role_offsets = np.concatenate([[0], np.cumsum(self.role_sizes)])
+
+        self.role_ids = {role: i for i, role in enumerate(self.roles)}
+
+        # Integer skill-ID sets per requirement, resolved once; per-role matching is then set intersection
+        self._satisfying_ids = {}
+        self._containing_ids = {}
+        rows, cols = [], []
+        for req_id, requirement in enumerate(self.requirements):
+            ids = self.satisfying_ids(requirement)
+            self.containing_ids(requirement)
+            rows.extend([req_id] * len(ids))
+            cols.extend(ids)
+        self.requirement_matrix = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, cols)), shape=(len(self.requirements), len(self.skills))
+        )
+        role_rows = np.repeat(np.arange(len(self.roles)), self.role_sizes)
+        self.role_matrix = sparse.csr_matrix(
+            (np.ones(len(role_rows), dtype=np.float32), (role_rows, np.arange(len(self.requirements)))),
+            shape=(len(self.roles), len(self.requirements)),
+        )
+
+    def satisfying_ids(self, requirement: str) -> frozenset:
+        """Taxonomy skill IDs meeting a requirement under the analyze_skill_match rule; cached per requirement"""
+        key = requirement.lower()
+        ids = self._satisfying_ids.get(key)
+        if ids is None:
+            ids = self._satisfying_ids[key] = frozenset(
+                i for i, skill in enumerate(self.skills) if skill in key or key in skill
+            )
+        return ids
+
+    def containing_ids(self, requirement: str) -> frozenset:
+        """Taxonomy skill IDs whose name contains the requirement (the check_missing_skills rule); cached"""
+        key = requirement.lower()
+        ids = self._containing_ids.get(key)
+        if ids is None:
+            ids = self._containing_ids[key] = frozenset(i for i, skill in enumerate(self.skills) if key in skill)
+        return ids
+
+    def split_skills(self, candidate_skills: SkillInput):
+        """(set of taxonomy skill IDs, lowercased names outside the taxonomy)"""
+        ids, extra = set(), []
+        for skill in flatten_skills(candidate_skills):
+            name = skill.lower()
+            skill_id = self.skill_ids.get(name)
+            if skill_id is None:
+                extra.append(name)
+            else:
+                ids.add(skill_id)
+        return ids, extra
+
+    def match(self, candidate_skills: SkillInput, required_skills: List[str]) -> Dict:
+        """analyze_skill_match by set intersection on skill IDs"""
+        ids, extra = self.split_skills(candidate_skills)
+        matched_skills, missing_skills = [], []
+        for requirement in required_skills:
+            if not ids.isdisjoint(self.satisfying_ids(requirement)) or any(satisfies(name, requirement) for name in extra):
+                matched_skills.append(requirement)
+            else:
+                missing_skills.append(requirement)
+        return {
+            'match_percentage': (len(matched_skills) / len(required_skills)) * 100 if required_skills else 0,
+            'matched_skills': matched_skills,
+            'missing_skills': missing_skills,
+        }
+
+    def missing(self, extracted_skills: SkillInput, role_skills: List[str]) -> List[str]:
+        """check_missing_skills by set intersection: requirements that no extracted skill contains"""
+        ids, extra = self.split_skills(extracted_skills)
+        return [
+            requirement for requirement in role_skills
+            if ids.isdisjoint(self.containing_ids(requirement)) and not any(requirement.lower() in name for name in extra)
+        ]
+
+    def score_pairs(self, candidate_skills: List[SkillInput], roles: List[str]) -> np.ndarray:
+        """
+        Match percentages for many (skills, role) pairs in one sparse product
+        Args:
+            candidate_skills: One skill dict or list per pair
+            roles: Role name per pair; must be keys of job_roles_skills
+        Returns:
+            np.ndarray: Match percentage per pair, as analyze_skill_match would compute it
+        """
+        rows, cols, extra_rows = [], [], []
+        for row, skills in enumerate(candidate_skills):
+            ids, extra = self.split_skills(skills)
+            rows.extend([row] * len(ids))
+            cols.extend(ids)
+            if extra:
+                extra_rows.append(row)
+        candidates = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, cols)), shape=(len(candidate_skills), len(self.skills))
+        )
+        role_ids = np.array([self.role_ids[role] for role in roles], dtype=np.intp)
+
+        # (pairs x requirements) > 0 marks met requirements; masking with each pair's role row keeps only that role's
+        satisfied = (candidates @ self.requirement_matrix.T) > 0
+        counts = np.asarray(satisfied.multiply(self.role_matrix[role_ids]).sum(axis=1)).ravel()
+        for row in extra_rows:
+            role_id = role_ids[row]
+            start, end = self.role_offsets[role_id], self.role_offsets[role_id + 1]
+            counts[row] = len(self.match(candidate_skills[row], self.requirements[start:end])['matched_skills'])
+
+        sizes = self.role_sizes[role_ids]
+        return np.divide(counts * 100, sizes, out=np.zeros(len(role_ids)), where=sizes > 0)
+
+    def satisfied_requirements(self, candidate_skills: SkillInput) -> np.ndarray:
+        """Boolean vector over self.requirements: which ones the candidate's skills meet"""
+        ids, extra = self.split_skills(candidate_skills)
+        vector = np.zeros(len(self.skills), dtype=np.float32)
+        vector[list(ids)] = 1
+        satisfied = self.requirement_matrix @ vector > 0
+        # Skills outside the taxonomy (e.g. sent by a client) are matched by string
+        for name in extra:
+            satisfied |= np.array([satisfies(name, requirement) for requirement in self.requirements], dtype=bool)
+        return satisfied
+
+    def rank_roles(self, candidate_skills: SkillInput, top_k: int = 5) -> List[Dict]:
+        """
+        Match percentage of the candidate against every role, best first
+        Args:
+            candidate_skills: categorized_skills dict or list of skill names
+            top_k: Leading roles that also get matched_skills and missing_skills
+        Returns:
+            list: {"role", "match_percentage"[, "matched_skills", "missing_skills"]} for every role
+        """
+        satisfied = self.satisfied_requirements(candidate_skills)
+        counts = self.role_matrix @ satisfied.astype(np.float32)
+        percentages = np.divide(counts * 100, self.role_sizes, out=np.zeros(len(self.roles)), where=self.role_sizes > 0)
+        order = np.argsort(-percentages, kind='stable')
+
+        ranked = []
+        for rank, role_id in enumerate(order):
+            entry = {"role": self.roles[role_id], "match_percentage": float(percentages[role_id])}
+            if rank < top_k:
+                start, end = self.role_offsets[role_id], self.role_offsets[role_id + 1]
+                requirements = self.requirements[start:end]
+                entry["matched_skills"] = [req for req, ok in zip(requirements, satisfied[start:end]) if ok]
+                entry["missing_skills"] = [req for req, ok in zip(requirements, satisfied[start:end]) if not ok]
+            ranked.append(entry)
+        return ranked
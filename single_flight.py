@@ -0,0 +1,82 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Dict, Hashable, Set
+
+
+class SingleFlight:
+    def __init__(self):
+        """
+        Coalesces concurrent calls for the same key into one
+        The first caller for a key runs the call; callers arriving while it is in
+        flight wait for its result instead of starting their own. Threads and
+        coroutines share the same in-flight calls, since each call's result is held
+        in a concurrent.futures.Future that both can wait on.
+        """
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Hashable, Future] = {}
+        # The event loop only keeps weak references to tasks
+        self._tasks: Set[asyncio.Task] = set()
+        self.calls = 0
+        self.coalesced = 0
+
+    def _join(self, key: Hashable):
+        """(future, whether this caller runs the call)"""
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+            future = self._in_flight[key] = Future()
+            # A running future cannot be cancelled by a waiter giving up
+            future.set_running_or_notify_cancel()
+            self.calls += 1
+            return future, True
+
+    def _finish(self, key: Hashable, future: Future, result=None, error: BaseException = None) -> None:
+        with self._lock:
+            del self._in_flight[key]
+        if error is None:
+            future.set_result(result)
+        else:
+            future.set_exception(error)
+
+    def do(self, key: Hashable, fn: Callable):
+        """Result of fn(), shared with every concurrent caller using the same key"""
+        future, leader = self._join(key)
+        if not leader:
+            return future.result()
+        try:
+            result = fn()
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result)
+        return result
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable]):
+        """Result of await fn(), shared with every concurrent caller, sync or async, using the same key"""
+        future, leader = self._join(key)
+        if leader:
+            # The call runs as its own task, so cancelling the caller that started it
+            # leaves it running for everyone else waiting on the same key
+            task = asyncio.ensure_future(fn())
+            self._tasks.add(task)
+            task.add_done_callback(lambda done: self._settle(key, future, done))
+        # Shielded so a caller that is cancelled does not cancel the shared call
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+    def _settle(self, key: Hashable, future: Future, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if task.cancelled():
+            # Only happens if the task itself is cancelled, e.g. at event loop shutdown
+            self._finish(key, future, error=RuntimeError("Coalesced call was cancelled"))
+        elif task.exception() is not None:
+            self._finish(key, future, error=task.exception())
+        else:
+            self._finish(key, future, task.result())
+
+    def stats(self) -> Dict:
+        with self._lock:
+            in_flight = len(self._in_flight)
+        return {"calls": self.calls, "coalesced": self.coalesced, "in_flight": in_flight}
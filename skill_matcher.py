@@ -0,0 +1,116 @@
+from collections import deque
+from typing import Dict, Hashable, List, Set
+
+
+def _is_word_char(ch: str) -> bool:
+    """Same definition of a word character as the re module's \\w for str patterns"""
+    return ch.isalnum() or ch == '_'
+
+
+class SkillMatcher:
+    def __init__(self):
+        """
+        Aho-Corasick automaton that finds every taxonomy term in one pass over a text
+        A term only counts where the regex r'\\b' + re.escape(term) + r'\\b' would
+        match, so results are identical to searching for each term separately.
+        Several terms (e.g. a skill and its aliases) may share a payload.
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._term_ends: List[List[int]] = [[]]
+        self._outputs: List[List[int]] = [[]]
+        self._terms: List[str] = []
+        self._payloads: List[list] = []
+        self._term_ids: Dict[str, int] = {}
+        self._built = False
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def add(self, term: str, payload: Hashable) -> None:
+        """
+        Register a term to search for
+        Args:
+            term: Skill name or alias; matched case-insensitively
+            payload: Value reported when the term is found
+        """
+        term = term.lower()
+        if not term:
+            return
+        term_id = self._term_ids.get(term)
+        if term_id is None:
+            term_id = self._term_ids[term] = len(self._terms)
+            self._terms.append(term)
+            self._payloads.append([])
+
+            state = 0
+            for ch in term:
+                next_state = self._goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][ch] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._term_ends.append([])
+                state = next_state
+            self._term_ends[state].append(term_id)
+        if payload not in self._payloads[term_id]:
+            self._payloads[term_id].append(payload)
+        self._built = False
+
+    def build(self) -> "SkillMatcher":
+        """Compute failure links; called automatically before the first search after an add"""
+        self._outputs = [list(ends) for ends in self._term_ends]
+        queue = deque()
+        for state in self._goto[0].values():
+            self._fail[state] = 0
+            queue.append(state)
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(ch, 0)
+                self._outputs[next_state] = self._outputs[next_state] + self._outputs[self._fail[next_state]]
+        self._built = True
+        return self
+
+    def find(self, text: str) -> Set[Hashable]:
+        """
+        Payloads of every term occurring in text at word boundaries
+        Args:
+            text: Text to scan; callers lowercase it, as terms are stored lowercased
+        Returns:
+            Set of matched payloads
+        """
+        if not self._built:
+            self.build()
+        goto, fail, outputs, terms = self._goto, self._fail, self._outputs, self._terms
+        found_terms = set()
+        state = 0
+        n = len(text)
+        for end, ch in enumerate(text, 1):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not outputs[state]:
+                continue
+            for term_id in outputs[state]:
+                if term_id in found_terms:
+                    continue
+                start = end - len(terms[term_id])
+                if self._is_boundary(text, start, n) and self._is_boundary(text, end, n):
+                    found_terms.add(term_id)
+
+        payloads = set()
+        for term_id in found_terms:
+            payloads.update(self._payloads[term_id])
+        return payloads
+
+    @staticmethod
+    def _is_boundary(text: str, pos: int, n: int) -> bool:
+        before = pos > 0 and _is_word_char(text[pos - 1])
+        after = pos < n and _is_word_char(text[pos])
+        return before != after
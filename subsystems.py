@@ -0,0 +1,84 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+
+class SubsystemUnavailable(RuntimeError):
+    """Raised when a subsystem failed to initialize"""
+
+
+class Subsystem:
+    def __init__(self, name: str, factory: Callable):
+        """
+        Wrap an expensive object so it is built in the background or on first use
+        Args:
+            name: Name reported by the readiness endpoint
+            factory: Zero-argument callable that builds the object
+        """
+        self.name = name
+        self.factory = factory
+        self.state = PENDING
+        self.error = None
+        self.load_seconds = None
+        self._instance = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Begin loading on a daemon thread; returns immediately"""
+        if self.state != PENDING:
+            return
+        thread = threading.Thread(target=self._load_quietly, name=f"init-{self.name}", daemon=True)
+        thread.start()
+
+    def get(self):
+        """
+        Return the object, building it now if no one has yet
+        Blocks while another thread is still loading it.
+        Raises:
+            SubsystemUnavailable: If initialization failed
+        """
+        if self.state == READY:
+            return self._instance
+        with self._lock:
+            if self.state == PENDING:
+                self._load()
+            if self.state == FAILED:
+                raise SubsystemUnavailable(f"{self.name} failed to initialize: {self.error}")
+            return self._instance
+
+    def status(self) -> Dict:
+        """State summary for the readiness endpoint"""
+        status = {"state": self.state}
+        if self.load_seconds is not None:
+            status["load_seconds"] = round(self.load_seconds, 3)
+        if self.error is not None:
+            status["error"] = self.error
+        return status
+
+    def _load(self) -> None:
+        self.state = LOADING
+        start = time.perf_counter()
+        try:
+            self._instance = self.factory()
+            self.state = READY
+            logger.info(f"{self.name} initialized")
+        except Exception as e:
+            self.error = str(e)
+            self.state = FAILED
+            logger.error(f"Failed to initialize {self.name}: {e}")
+        finally:
+            self.load_seconds = time.perf_counter() - start
+
+    def _load_quietly(self) -> None:
+        try:
+            self.get()
+        except SubsystemUnavailable:
+            pass
@@ -0,0 +1,153 @@
+import asyncio
+import sqlite3
+import threading
+
+import pytest
+
+import tiered_cache
+from advice_cache import AdviceCache
+from gemini_integration import GeminiSkillsAdvisor
+
+
+class Response:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeModel:
+    """Stands in for genai.GenerativeModel and counts calls per skill"""
+
+    def __init__(self):
+        self.calls = []
+
+    def generate_content(self, prompt, **kwargs):
+        skill = prompt.split('"')[1]
+        self.calls.append(skill)
+        if skill == "broken":
+            raise RuntimeError("quota exceeded")
+        return Response(f"advice for {skill}")
+
+    async def generate_content_async(self, prompt, **kwargs):
+        return self.generate_content(prompt, **kwargs)
+
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(tiered_cache.time, "time", clock.time)
+    return clock
+
+
+def test_hits_and_misses():
+    model = FakeModel()
+    advisor = GeminiSkillsAdvisor(model=model, cache=AdviceCache())
+
+    assert advisor.get_skill_information("Docker") == "advice for Docker"
+    # Same skill up to case and spacing: served from the cache
+    assert advisor.get_skill_information("  docker ") == "advice for Docker"
+    assert advisor.get_missing_skills_info(["Docker", "SQL"]) == {"Docker": "advice for Docker", "SQL": "advice for SQL"}
+
+    assert model.calls == ["Docker", "SQL"]
+    stats = advisor.cache.stats()
+    assert (stats["memory_hits"], stats["disk_hits"], stats["misses"]) == (2, 0, 2)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_errors_are_not_cached():
+    model = FakeModel()
+    advisor = GeminiSkillsAdvisor(model=model, cache=AdviceCache())
+
+    assert advisor.get_skill_information("broken").startswith("Error fetching information about broken")
+    advisor.get_skill_information("broken")
+    assert model.calls == ["broken", "broken"]
+    assert advisor.cache.stats()["entries"] == 0
+
+
+def test_ttl_expiry(clock, tmp_path):
+    model = FakeModel()
+    advisor = GeminiSkillsAdvisor(model=model, cache=AdviceCache(db_path=str(tmp_path / "advice.db"), ttl=60))
+
+    advisor.get_skill_information("Docker")
+    clock.now += 59
+    advisor.get_skill_information("Docker")
+    assert model.calls == ["Docker"]
+
+    clock.now += 2
+    advisor.get_skill_information("Docker")
+    assert model.calls == ["Docker", "Docker"]
+    assert advisor.cache.stats()["expired"] == 1
+
+
+def test_disk_tier_survives_restart_and_is_size_bounded(clock, tmp_path):
+    db_path = str(tmp_path / "advice.db")
+    model = FakeModel()
+    advisor = GeminiSkillsAdvisor(model=model, cache=AdviceCache(db_path=db_path, max_disk_entries=2))
+    for skill in ["Docker", "SQL", "Git"]:
+        advisor.get_skill_information(skill)
+        clock.now += 1
+
+    with sqlite3.connect(db_path) as db:
+        assert db.execute("SELECT COUNT(*) FROM advice_cache").fetchone()[0] == 2
+
+    # A new process starts with an empty memory tier: the two newest answers come from disk
+    restarted = GeminiSkillsAdvisor(model=model, cache=AdviceCache(db_path=db_path, max_disk_entries=2))
+    for skill in ["SQL", "Git", "Docker"]:
+        restarted.get_skill_information(skill)
+    assert model.calls == ["Docker", "SQL", "Git", "Docker"]
+    stats = restarted.cache.stats()
+    assert (stats["disk_hits"], stats["misses"]) == (2, 1)
+
+
+def test_prompt_or_model_change_misses():
+    cache = AdviceCache()
+    cache.put(AdviceCache.advice_key("Docker", "prompt v1", "model-a"), "old")
+    assert cache.get(AdviceCache.advice_key("docker", "prompt v1", "model-a")) == "old"
+    assert cache.get(AdviceCache.advice_key("Docker", "prompt v2", "model-a")) is None
+    assert cache.get(AdviceCache.advice_key("Docker", "prompt v1", "model-b")) is None
+
+
+def test_bundle_needs_no_client(monkeypatch):
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+    advisor = GeminiSkillsAdvisor(bundle={"docker": "bundled docker advice"})
+
+    assert advisor._model is None
+    assert advisor.get_missing_skills_info(["Docker"]) == {"Docker": "bundled docker advice"}
+    assert advisor._model is None
+    # A skill the bundle lacks needs the client, and failing to build it is a per-skill error
+    assert advisor.get_skill_information("SQL").startswith("Error fetching information about SQL")
+
+
+class ThreadRecordingCache(AdviceCache):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.threads = []
+
+    def get(self, key):
+        self.threads.append(threading.get_ident())
+        return super().get(key)
+
+    def put(self, key, advice, fill_seconds=None):
+        self.threads.append(threading.get_ident())
+        super().put(key, advice, fill_seconds)
+
+
+@pytest.mark.parametrize("mode", ["per_skill", "batch"])
+def test_async_paths_keep_sqlite_off_the_event_loop(tmp_path, mode):
+    cache = ThreadRecordingCache(db_path=str(tmp_path / "advice.db"))
+    advisor = GeminiSkillsAdvisor(model=FakeModel(), cache=cache, mode=mode)
+
+    async def run():
+        await advisor.get_missing_skills_info_async(["Docker", "SQL"])
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(run())
+    assert cache.threads
+    assert loop_thread not in cache.threads
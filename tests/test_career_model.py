@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+
+from career_model import ALPHA, EPSILON, GAMMA, _apply_batch_updates, train_q_table_batched
+
+
+def small_dataset(n_rows=40, n_roles=5, seed=0):
+    rng = np.random.default_rng(seed)
+    current = rng.integers(0, n_roles, n_rows)
+    current[:n_roles] = np.arange(n_roles)
+    next_roles = rng.integers(0, n_roles, n_rows)
+    next_roles[:n_roles] = np.arange(n_roles)
+    salary = rng.uniform(3, 30, n_rows)
+    return pd.DataFrame({
+        "current_role": current,
+        "next_role": next_roles,
+        "current_salary_LPA": salary,
+        "predicted_salary_LPA": salary + rng.uniform(-5, 10, n_rows),
+    })
+
+
+def sequential_updates(q_table, cells, targets):
+    flat = q_table.reshape(-1)
+    for cell, target in zip(cells, targets):
+        flat[cell] = (1 - ALPHA) * flat[cell] + ALPHA * target
+
+
+def test_batch_updates_match_sequential_with_repeated_cells():
+    rng = np.random.default_rng(1)
+    q_table = rng.normal(size=(4, 3))
+    # 200 updates over 12 cells, so every cell is hit many times within the batch
+    cells = rng.integers(0, q_table.size, 200)
+    targets = rng.normal(size=200)
+
+    expected = q_table.copy()
+    sequential_updates(expected, cells, targets)
+    _apply_batch_updates(q_table, cells, targets)
+
+    np.testing.assert_allclose(q_table, expected, rtol=1e-12, atol=1e-12)
+
+
+def test_batch_updates_single_cell():
+    q_table = np.zeros((1, 1))
+    _apply_batch_updates(q_table, np.zeros(3, dtype=np.intp), np.array([1.0, 2.0, 3.0]))
+
+    expected = np.zeros((1, 1))
+    sequential_updates(expected, [0, 0, 0], [1.0, 2.0, 3.0])
+    np.testing.assert_allclose(q_table, expected, rtol=1e-12)
+
+
+def reference_trainer(df, episodes, seed, batch_size):
+    """train_q_table_batched written as a plain loop: targets are frozen per batch, updates applied one by one"""
+    rng = np.random.default_rng(seed)
+    roles = df['current_role'].to_numpy()
+    next_roles = df['next_role'].to_numpy()
+    rewards = np.maximum(df['predicted_salary_LPA'].to_numpy() - df['current_salary_LPA'].to_numpy(), 0)
+    n_actions = df['next_role'].nunique()
+    q_table = np.zeros((df['current_role'].nunique(), n_actions))
+
+    done = 0
+    while done < episodes:
+        size = min(batch_size, episodes - done)
+        rows = rng.integers(0, len(df), size)
+        explore = rng.random(size) < EPSILON
+        random_actions = rng.integers(0, n_actions, size)
+        next_states = roles[rng.integers(0, len(df), size)]
+
+        frozen = q_table.copy()
+        cells, targets = [], []
+        for i, row in enumerate(rows):
+            state = roles[row]
+            action = random_actions[i] if explore[i] else int(frozen[state].argmax())
+            reward = rewards[row] if action == next_roles[row] else 0.0
+            cells.append(state * n_actions + action)
+            targets.append(reward + GAMMA * frozen[next_states[i]].max())
+        sequential_updates(q_table, cells, targets)
+        done += size
+    return q_table
+
+
+def test_batched_trainer_matches_sequential_updates():
+    df = small_dataset()
+    # 64-episode batches over 25 (state, action) cells repeat pairs within every batch
+    for batch_size in (1, 64):
+        expected = reference_trainer(df, episodes=500, seed=7, batch_size=batch_size)
+        actual = train_q_table_batched(df, episodes=500, seed=7, batch_size=batch_size)
+        np.testing.assert_allclose(actual, expected, rtol=1e-10, atol=1e-10)
+
+
+def test_batched_trainer_is_seeded():
+    df = small_dataset()
+    np.testing.assert_array_equal(train_q_table_batched(df, episodes=300, seed=3),
+                                  train_q_table_batched(df, episodes=300, seed=3))
@@ -0,0 +1,163 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from single_flight import SingleFlight
+
+
+def test_concurrent_calls_share_one_result():
+    flight = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "advice"
+
+    async def run():
+        return await asyncio.gather(*(flight.do_async("docker", fetch) for _ in range(5)))
+
+    assert asyncio.run(run()) == ["advice"] * 5
+    assert len(calls) == 1
+    assert flight.stats() == {"calls": 1, "coalesced": 4, "in_flight": 0}
+
+
+def test_cancelled_leader_does_not_fail_followers():
+    flight = SingleFlight()
+    release = None
+
+    async def fetch():
+        await release.wait()
+        return "advice"
+
+    async def run():
+        nonlocal release
+        release = asyncio.Event()
+        leader = asyncio.ensure_future(flight.do_async("docker", fetch))
+        await asyncio.sleep(0)
+        followers = [asyncio.ensure_future(flight.do_async("docker", fetch)) for _ in range(3)]
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await asyncio.gather(*followers)
+
+    assert asyncio.run(run()) == ["advice"] * 3
+    assert flight.stats() == {"calls": 1, "coalesced": 3, "in_flight": 0}
+
+
+def test_errors_reach_every_caller_and_are_not_kept():
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("quota exceeded")
+
+    async def run():
+        return await asyncio.gather(*(flight.do_async("docker", fail) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert [type(result) for result in results] == [ValueError] * 3
+    assert flight.stats()["in_flight"] == 0
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out waiting for callers to join"
+        time.sleep(0.001)
+
+
+def test_threads_share_one_call():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls, results = [], []
+
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return "advice"
+
+    def call():
+        results.append(flight.do("docker", fetch))
+
+    threads = [threading.Thread(target=call) for _ in range(5)]
+    threads[0].start()
+    wait_for(lambda: flight.stats()["in_flight"] == 1)
+    for thread in threads[1:]:
+        thread.start()
+    wait_for(lambda: flight.stats()["coalesced"] == 4)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == ["advice"] * 5
+    assert len(calls) == 1
+    assert flight.stats() == {"calls": 1, "coalesced": 4, "in_flight": 0}
+
+
+def test_coroutine_joins_a_threads_call():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls, results = [], []
+
+    def fetch():
+        calls.append("thread")
+        release.wait(5)
+        return "advice"
+
+    async def fetch_async():
+        calls.append("coroutine")
+        return "other"
+
+    thread = threading.Thread(target=lambda: results.append(flight.do("docker", fetch)))
+    thread.start()
+    wait_for(lambda: flight.stats()["in_flight"] == 1)
+
+    async def run():
+        follower = asyncio.ensure_future(flight.do_async("docker", fetch_async))
+        await asyncio.sleep(0)
+        release.set()
+        return await follower
+
+    assert asyncio.run(run()) == "advice"
+    thread.join(5)
+    assert results == ["advice"]
+    assert calls == ["thread"]
+    assert flight.stats() == {"calls": 1, "coalesced": 1, "in_flight": 0}
+
+
+def test_thread_joins_a_coroutines_call():
+    flight = SingleFlight()
+    calls = []
+
+    def fetch():
+        calls.append("thread")
+        return "other"
+
+    async def run():
+        release = asyncio.Event()
+
+        async def fetch_async():
+            calls.append("coroutine")
+            await release.wait()
+            return "advice"
+
+        async def joined():
+            while flight.stats()["coalesced"] < 1:
+                await asyncio.sleep(0.001)
+
+        leader = asyncio.ensure_future(flight.do_async("docker", fetch_async))
+        await asyncio.sleep(0)
+        follower = asyncio.get_running_loop().run_in_executor(None, flight.do, "docker", fetch)
+        await asyncio.wait_for(joined(), timeout=5)
+        release.set()
+        return await asyncio.gather(leader, follower)
+
+    assert asyncio.run(run()) == ["advice", "advice"]
+    assert calls == ["coroutine"]
+    assert flight.stats() == {"calls": 1, "coalesced": 1, "in_flight": 0}
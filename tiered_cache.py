@@ -0,0 +1,129 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TieredCache:
+    def __init__(self, table: str, max_entries: int = 1024, db_path: Optional[str] = None, ttl: Optional[float] = None,
+                 max_disk_entries: int = 10000):
+        """
+        In-memory LRU in front of an optional SQLite table, for JSON-serializable values
+        Entries expire after ttl seconds in both tiers; expired rows are deleted on
+        write, and the SQLite tier keeps only the newest max_disk_entries rows.
+        Args:
+            table: SQLite table holding this cache's rows
+            max_entries: Size of the in-memory LRU tier
+            db_path: SQLite file for the on-disk tier; None keeps the cache in memory only
+            ttl: Seconds an entry stays valid; 0 or None never expires
+            max_disk_entries: Rows kept in the SQLite tier
+        """
+        self.table = table
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self.ttl = ttl or None
+        self.max_disk_entries = max_disk_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection = None
+        self._connection_pid = None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.expired = 0
+
+    def _db(self) -> sqlite3.Connection:
+        """Connection for this process; reopened after a fork since SQLite connections must not be shared"""
+        if self._connection is None or self._connection_pid != os.getpid():
+            connection = sqlite3.connect(self.db_path, check_same_thread=False)
+            connection.execute(f"CREATE TABLE IF NOT EXISTS {self.table} (key TEXT PRIMARY KEY, value TEXT, created REAL)")
+            connection.execute(f"CREATE INDEX IF NOT EXISTS {self.table}_created ON {self.table} (created)")
+            connection.commit()
+            self._connection = connection
+            self._connection_pid = os.getpid()
+        return self._connection
+
+    def _remember(self, key: str, value: Any, created: float) -> None:
+        self._entries[key] = (value, created)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _is_fresh(self, created: float, now: float) -> bool:
+        return self.ttl is None or now - created < self.ttl
+
+    def get(self, key: str) -> Optional[Any]:
+        """Cached value for key, or None if absent or expired"""
+        now = time.time()
+        with self._lock:
+            stale = False
+            cached = self._entries.get(key)
+            if cached is not None:
+                if self._is_fresh(cached[1], now):
+                    self._entries.move_to_end(key)
+                    self.memory_hits += 1
+                    return cached[0]
+                del self._entries[key]
+                stale = True
+
+            if self.db_path:
+                try:
+                    row = self._db().execute(f"SELECT value, created FROM {self.table} WHERE key = ?", (key,)).fetchone()
+                    if row is not None and not self._is_fresh(row[1], now):
+                        self._db().execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                        self._db().commit()
+                        stale, row = True, None
+                except sqlite3.Error as e:
+                    logger.warning(f"{self.table} lookup failed: {e}")
+                    row = None
+                if row is not None:
+                    value = json.loads(row[0])
+                    self._remember(key, value, row[1])
+                    self.disk_hits += 1
+                    return value
+
+            if stale:
+                self.expired += 1
+            self.misses += 1
+            return None
+
+    def put(self, key: str, value: Any) -> None:
+        created = time.time()
+        with self._lock:
+            self._remember(key, value, created)
+            if self.db_path:
+                try:
+                    db = self._db()
+                    db.execute(f"INSERT OR REPLACE INTO {self.table} VALUES (?, ?, ?)", (key, json.dumps(value), created))
+                    # Expired rows are deleted rather than left until they are looked up again
+                    if self.ttl is not None:
+                        db.execute(f"DELETE FROM {self.table} WHERE created < ?", (created - self.ttl,))
+                    db.execute(
+                        f"DELETE FROM {self.table} WHERE key IN "
+                        f"(SELECT key FROM {self.table} ORDER BY created DESC LIMIT -1 OFFSET ?)",
+                        (self.max_disk_entries,),
+                    )
+                    db.commit()
+                except sqlite3.Error as e:
+                    logger.warning(f"{self.table} write failed: {e}")
+
+    def stats(self) -> Dict:
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "ttl_seconds": self.ttl,
+            "disk": self.db_path,
+        }